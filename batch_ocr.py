@@ -0,0 +1,164 @@
+"""
+Bulk image OCR for Live Screen Text Extractor
+Streams image paths through a process pool with a bounded number of jobs
+in flight, so folders with tens of thousands of screenshots are processed
+with flat memory use. Results are yielded as they finish, and a
+checkpoint file lets an interrupted run pick up where it stopped.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from ocr_engine import DEFAULT_LANGUAGE, DEFAULT_OEM, get_default_backend, set_default_backend
+from ocr_executor import default_worker_count
+from ocr_pipeline import DEFAULT_OCR_CONFIG, extract_text_from_file
+from preprocessing import DEFAULT_PROFILE
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp'}
+
+
+def iter_image_paths(paths):
+    """Yield image files from a mix of file and directory paths
+
+    Directories are walked recursively in sorted order; files given
+    explicitly are yielded whatever their extension. Paths are produced
+    lazily, so huge trees are never listed into memory at once.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def ocr_file(path, config=DEFAULT_OCR_CONFIG, cache=None, profile=DEFAULT_PROFILE,
+             lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM, postprocessor=None):
+    """OCR one image file and return its result record
+
+    Returns:
+        Dict with 'source', 'text', 'error' and 'elapsed_ms'; exceptions
+        are reported in 'error' rather than raised
+    """
+    record = {'source': path}
+    start = time.perf_counter()
+    try:
+        record['text'] = extract_text_from_file(path, config, cache=cache, profile=profile,
+                                                lang=lang, oem=oem, postprocessor=postprocessor)
+        record['error'] = None
+    except Exception as e:
+        record['text'] = None
+        record['error'] = str(e)
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+class Checkpoint:
+    """Append-only record of the paths a batch run has completed
+
+    One JSON-encoded path per line, flushed after every result, so a
+    crash loses at most the jobs that were still in flight. Failed files
+    are not recorded and are retried on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._done = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try:
+                            self._done.add(json.loads(line))
+                        except ValueError:
+                            # Torn last line from an interrupted write
+                            continue
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, path):
+        return path in self._done
+
+    def __len__(self):
+        return len(self._done)
+
+    def mark_done(self, path):
+        """Record path as completed"""
+        self._done.add(path)
+        self._file.write(json.dumps(path) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _init_worker(backend):
+    """Process pool initializer: use the same OCR backend as the parent"""
+    set_default_backend(backend)
+
+
+def run_batch(paths, config=DEFAULT_OCR_CONFIG, workers=None, processes=True,
+              checkpoint=None, max_pending=None, cache=None, profile=DEFAULT_PROFILE,
+              lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM, postprocessor=None):
+    """OCR image files in parallel and yield result records as they finish
+
+    Args:
+        paths: Iterable of image paths; consumed lazily
+        config: Tesseract configuration string
+        workers: Number of worker processes (or threads)
+        processes: Use a process pool; False uses threads instead
+        checkpoint: Optional Checkpoint; completed paths are skipped and
+            new successes are recorded in it
+        max_pending: Jobs allowed in flight at once (default: 4 per worker)
+        cache: OCRCache for thread mode; ignored with processes, which
+            cannot share one
+        profile: Preprocessing profile, see preprocessing.PROFILES
+        lang: Tesseract language; 'auto' detects each file's script
+        oem: Tesseract OCR engine mode
+        postprocessor: Optional OCRResult -> text callable, e.g. a
+            postprocessing.PostProcessor; must be picklable for processes
+
+    Yields:
+        Result dicts from ocr_file(), in completion order
+    """
+    workers = workers or default_worker_count()
+    max_pending = max_pending or workers * 4
+    if processes:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(get_default_backend(),))
+        cache = None
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-batch')
+
+    def finish(futures):
+        for future in futures:
+            record = future.result()
+            if checkpoint is not None and record['error'] is None:
+                checkpoint.mark_done(record['source'])
+            yield record
+
+    with pool:
+        pending = set()
+        for path in paths:
+            if checkpoint is not None and path in checkpoint:
+                continue
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finish(done)
+            pending.add(pool.submit(ocr_file, path, config, cache, profile, lang, oem,
+                                    postprocessor))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finish(done)
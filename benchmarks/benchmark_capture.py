@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Screen Capture Benchmark for Live Screen Text Extractor
+Reports grabs per second for every capture backend that works on this
+machine. Needs a display; on a headless Linux box run it under Xvfb:
+
+    xvfb-run -s "-screen 0 1920x1080x24" python benchmarks/benchmark_capture.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from capture_backends import CAPTURE_PREFERENCE, create_capture_backend  # noqa: E402
+
+REGION_SIZES = [(200, 50), (800, 200), (1280, 720)]
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def benchmark_backend(backend, duration):
+    """Print grabs per second for each region size on one backend"""
+    try:
+        grabber = create_capture_backend(backend)
+        grabber.grab((0, 0, 10, 10))
+    except Exception as e:
+        print(f"{backend:<10} unavailable ({e})")
+        return
+
+    try:
+        for width, height in REGION_SIZES:
+            bbox = (0, 0, width, height)
+            grabs = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < duration:
+                grabber.grab(bbox)
+                grabs += 1
+            elapsed = time.perf_counter() - start
+            print(f"{backend:<10} {width:>5}x{height:<5} {grabs / elapsed:8.1f} grabs/s   "
+                  f"{elapsed / grabs * 1000:7.2f} ms/grab")
+    finally:
+        grabber.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare screen capture backends")
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help="seconds spent on each region size")
+    args = parser.parse_args()
+
+    print_header("Screen Capture Throughput")
+    for backend in CAPTURE_PREFERENCE:
+        benchmark_backend(backend, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+OCR Engine Benchmark for Live Screen Text Extractor
+Compares per-call latency of the available OCR backends on the same image
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ocr_engine import BACKEND_PREFERENCE, OCREngineError, create_engine  # noqa: E402
+from ocr_pipeline import DEFAULT_OCR_CONFIG, preprocess_image  # noqa: E402
+from synthetic_images import SAMPLE_LINES, render_text_image  # noqa: E402
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def benchmark_backend(backend, image, iterations):
+    """Time repeated image_to_string calls on one backend
+
+    Returns:
+        List of per-call latencies in milliseconds, or None if the
+        backend is not available
+    """
+    try:
+        start = time.perf_counter()
+        engine = create_engine(backend)
+        init_ms = (time.perf_counter() - start) * 1000
+    except OCREngineError as e:
+        print(f"{backend:<14} unavailable ({e})")
+        return None
+
+    try:
+        # Warm-up call so one-off costs are reported separately
+        try:
+            engine.image_to_string(image, config=DEFAULT_OCR_CONFIG)
+        except Exception as e:
+            print(f"{backend:<14} failed ({e})")
+            return None
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            engine.image_to_string(image, config=DEFAULT_OCR_CONFIG)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        engine.close()
+
+    print(f"{backend:<14} init {init_ms:8.1f} ms   "
+          f"mean {statistics.mean(timings):8.1f} ms   "
+          f"median {statistics.median(timings):8.1f} ms   "
+          f"min {min(timings):8.1f} ms")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR backend latency")
+    parser.add_argument('--iterations', type=int, default=20, help="calls per backend")
+    parser.add_argument('--lines', type=int, default=1,
+                        help="number of text lines in the test image (small crops favour in-process engines)")
+    args = parser.parse_args()
+
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(max(1, args.lines))]
+    image, _ = render_text_image(lines)
+    processed = preprocess_image(image)
+
+    print_header(f"OCR Backend Latency ({processed.width}x{processed.height}, {args.iterations} calls)")
+    results = {}
+    for backend in BACKEND_PREFERENCE:
+        timings = benchmark_backend(backend, processed, args.iterations)
+        if timings:
+            results[backend] = statistics.median(timings)
+
+    if 'pytesseract' in results and len(results) > 1:
+        print_header("Speed-up vs pytesseract (median)")
+        for backend, median in results.items():
+            if backend != 'pytesseract':
+                print(f"{backend:<14} {results['pytesseract'] / median:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark for Live Screen Text Extractor
+Times every stage of capture -> OCR on synthetic text images and writes
+p50, p95 and throughput per stage as JSON. Pass --baseline with the JSON
+of an earlier run to flag stages that got slower.
+
+Stages:
+    capture    - screen grab of a region the size of the image
+    color      - RGB to grayscale into the reused buffer
+    threshold  - binarisation of the grayscale buffer
+    ocr        - recognition of the binarised pixels
+    handoff    - worker thread to main thread delivery via OCRExecutor.poll()
+
+capture and ocr are skipped (and reported as such) when no display or
+no Tesseract is available. The GUI polls every OCR_POLL_INTERVAL_MS, so
+its hand-off can take up to that much longer than measured here.
+
+Examples:
+    python benchmarks/benchmark_pipeline.py --output baseline.json
+    python benchmarks/benchmark_pipeline.py --baseline baseline.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from capture_backends import get_capture_backend  # noqa: E402
+from ocr_engine import create_engine, get_default_backend  # noqa: E402
+from ocr_executor import OCRExecutor  # noqa: E402
+from ocr_pipeline import DEFAULT_OCR_CONFIG  # noqa: E402
+from preprocessing import PROFILES, Preprocessor  # noqa: E402
+from synthetic_images import FONT_NAMES, SAMPLE_LINES, THEMES, render_text_image  # noqa: E402
+
+FONT_SIZES = (10, 14, 20)
+# Region size presets as a number of text lines
+REGION_LINES = {'line': 1, 'paragraph': 8, 'page': 40}
+STAGES = ('capture', 'color', 'threshold', 'ocr', 'handoff')
+
+# Slowdowns smaller than this are timer noise, whatever the percentage
+MIN_REGRESSION_MS = 0.05
+
+BASE_CASE = {'font': FONT_NAMES[0], 'size': 14, 'theme': 'light', 'region': 'paragraph'}
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}", file=sys.stderr)
+    print(f" {title}", file=sys.stderr)
+    print(f"{'='*50}", file=sys.stderr)
+
+
+def build_cases(full=False):
+    """Return the benchmark cases as dicts of font, size, theme and region
+
+    By default each axis is varied on its own around BASE_CASE; full
+    runs every combination.
+    """
+    axes = {'font': FONT_NAMES, 'size': FONT_SIZES, 'theme': tuple(THEMES),
+            'region': tuple(REGION_LINES)}
+    if full:
+        cases = [{}]
+        for axis, values in axes.items():
+            cases = [dict(case, **{axis: value}) for case in cases for value in values]
+        return cases
+
+    cases = [dict(BASE_CASE)]
+    for axis, values in axes.items():
+        cases.extend(dict(BASE_CASE, **{axis: value}) for value in values if value != BASE_CASE[axis])
+    return cases
+
+
+def case_name(case):
+    return f"{Path(case['font']).stem}-{case['size']}px-{case['theme']}-{case['region']}"
+
+
+def summarize(timings):
+    """Reduce per-call timings (ms) to p50, p95 and calls per second"""
+    timings = np.asarray(timings)
+    return {
+        'n': int(len(timings)),
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'throughput_per_s': round(1000.0 / float(timings.mean()), 1) if timings.mean() > 0 else None,
+    }
+
+
+def time_calls(fn, iterations):
+    """Call fn iterations times and return per-call latencies in ms
+
+    One untimed warm-up call comes first so buffer allocation and lazy
+    initialisation are not counted.
+    """
+    fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def time_handoff(executor, iterations):
+    """Latency from a worker finishing to its callback running on this thread"""
+    timings = []
+    for _ in range(iterations):
+        delivered = []
+        executor.submit(time.perf_counter,
+                        on_done=lambda finished: delivered.append(time.perf_counter() - finished))
+        while not delivered:
+            executor.poll()
+        timings.append(delivered[0] * 1000)
+    return timings
+
+
+def benchmark_case(case, iterations, ocr_iterations, profile, engine, grab, executor):
+    """Time every stage for one case
+
+    Returns:
+        Dict mapping stage name to summarize() output, or to
+        {'skipped': reason}
+    """
+    lines = [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(REGION_LINES[case['region']])]
+    image, _ = render_text_image(lines, font_size=case['size'], theme=case['theme'],
+                                 font_name=case['font'])
+    pixels = np.asarray(image)
+    height, width = pixels.shape[:2]
+    preprocessor = Preprocessor()
+    results = {}
+
+    if grab is None:
+        results['capture'] = {'skipped': 'no capture backend'}
+    else:
+        try:
+            results['capture'] = summarize(time_calls(lambda: grab((0, 0, width, height)), iterations))
+        except Exception as e:
+            results['capture'] = {'skipped': str(e)}
+
+    results['color'] = summarize(time_calls(lambda: preprocessor.grayscale(pixels), iterations))
+
+    # Threshold from a fixed grayscale copy so every call sees the same
+    # input instead of the previous call's output
+    gray = preprocessor.grayscale(pixels).copy()
+    if profile == 'otsu':
+        work = np.empty_like(gray)
+
+        def threshold():
+            cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=work)
+    else:
+        def threshold():
+            preprocessor.binarize(gray, profile)
+    results['threshold'] = summarize(time_calls(threshold, iterations))
+
+    if engine is None:
+        results['ocr'] = {'skipped': 'no OCR engine'}
+    else:
+        binary = Preprocessor().binarize(pixels, profile)
+        results['ocr'] = summarize(time_calls(
+            lambda: engine.recognize_array(binary, config=DEFAULT_OCR_CONFIG), ocr_iterations))
+
+    results['handoff'] = summarize(time_handoff(executor, iterations))
+    return results
+
+
+def compare(report, baseline, tolerance):
+    """Return regressions where p50 grew by more than tolerance
+
+    Growth below MIN_REGRESSION_MS is ignored so sub-millisecond stages
+    do not flap.
+
+    Returns:
+        List of (case, stage, baseline p50, current p50)
+    """
+    regressions = []
+    for name, stages in report['cases'].items():
+        for stage, current in stages.items():
+            previous = baseline.get('cases', {}).get(name, {}).get(stage, {})
+            if 'p50_ms' not in current or 'p50_ms' not in previous:
+                continue
+            allowed = max(previous['p50_ms'] * tolerance, MIN_REGRESSION_MS)
+            if current['p50_ms'] - previous['p50_ms'] > allowed:
+                regressions.append((name, stage, previous['p50_ms'], current['p50_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each stage of the capture -> OCR pipeline")
+    parser.add_argument('--iterations', type=int, default=50,
+                        help="calls per stage (default: %(default)s)")
+    parser.add_argument('--ocr-iterations', type=int, default=10,
+                        help="OCR calls per case (default: %(default)s)")
+    parser.add_argument('--profile', choices=('auto',) + PROFILES, default='otsu',
+                        help="preprocessing profile for the threshold stage (default: %(default)s)")
+    parser.add_argument('--full', action='store_true',
+                        help="every font x size x theme x region combination")
+    parser.add_argument('--no-capture', action='store_true', help="skip the capture stage")
+    parser.add_argument('--no-ocr', action='store_true', help="skip the OCR stage")
+    parser.add_argument('--output', metavar='FILE', help="write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', metavar='FILE', help="JSON report of an earlier run to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed p50 slowdown against the baseline (default: %(default)s)")
+    args = parser.parse_args()
+
+    grab = None
+    if not args.no_capture:
+        try:
+            grab = get_capture_backend().grab
+        except Exception as e:
+            print(f"Capture unavailable ({e})", file=sys.stderr)
+
+    engine = None
+    if not args.no_ocr:
+        try:
+            engine = create_engine(get_default_backend())
+            engine.recognize_array(np.full((8, 8), 255, dtype=np.uint8), config=DEFAULT_OCR_CONFIG)
+        except Exception as e:
+            print(f"OCR unavailable ({e})", file=sys.stderr)
+            engine = None
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'ocr_backend': get_default_backend() if engine is not None else None,
+            'profile': args.profile,
+            'iterations': args.iterations,
+            'ocr_iterations': args.ocr_iterations,
+        },
+        'cases': {},
+    }
+
+    executor = OCRExecutor(max_workers=1)
+    try:
+        print_header("Pipeline stages (p50 ms)")
+        print(f"{'case':<40}" + ''.join(f"{stage:>10}" for stage in STAGES), file=sys.stderr)
+        for case in build_cases(args.full):
+            name = case_name(case)
+            results = benchmark_case(case, args.iterations, args.ocr_iterations, args.profile,
+                                     engine, grab, executor)
+            report['cases'][name] = results
+            cells = [f"{results[stage]['p50_ms']:10.3f}" if 'p50_ms' in results[stage] else f"{'-':>10}"
+                     for stage in STAGES]
+            print(f"{name:<40}" + ''.join(cells), file=sys.stderr)
+    finally:
+        executor.shutdown()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+    else:
+        print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.tolerance)
+        print_header(f"Against {args.baseline} (tolerance {args.tolerance:.0%})")
+        for name, stage, before, after in regressions:
+            print(f"REGRESSION {name} {stage}: {before:.3f} -> {after:.3f} ms", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
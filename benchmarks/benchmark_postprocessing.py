@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Post-processing Benchmark for Live Screen Text Extractor
+Measures the throughput of layout reconstruction and text corrections
+(postprocessing.py) on large synthetic OCR outputs, so the stage stays
+negligible next to Tesseract even for full-page and multi-page results.
+
+The OCR output is generated as Tesseract TSV (wrapped paragraphs with
+hyphenated words, followed by a three-column table), so no Tesseract is needed.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ocr_result import parse_tsv  # noqa: E402
+from postprocessing import RULE_SETS, PostProcessor, reconstruct_layout  # noqa: E402
+from synthetic_images import SAMPLE_LINES  # noqa: E402
+
+WORD_COUNTS = (1000, 10000, 100000)
+
+CHAR_WIDTH = 8
+LINE_HEIGHT = 16
+LINE_WIDTH_CHARS = 80
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def synthetic_tsv(word_count, seed=0):
+    """Tesseract TSV for about word_count words of page-like text"""
+    rng = random.Random(seed)
+    vocabulary = ' '.join(SAMPLE_LINES).split() + ['he1lo', 'w0rld', '1O5', 'continu-']
+    rows = []
+    words = block = 0
+    y = 0
+
+    def add_line(line_words, x_positions, block, line):
+        nonlocal y
+        rows.append(f"4\t1\t{block}\t1\t{line}\t0\t0\t{y}\t{LINE_WIDTH_CHARS * CHAR_WIDTH}\t{LINE_HEIGHT}\t-1\t")
+        for index, (word, x) in enumerate(zip(line_words, x_positions), 1):
+            rows.append(f"5\t1\t{block}\t1\t{line}\t{index}\t{x}\t{y}\t{len(word) * CHAR_WIDTH}"
+                        f"\t{LINE_HEIGHT}\t{rng.randint(40, 96)}\t{word}")
+        y += LINE_HEIGHT + 4
+
+    while words < word_count:
+        # A wrapped paragraph
+        block += 1
+        rows.append(f"2\t1\t{block}\t0\t0\t0\t0\t{y}\t{LINE_WIDTH_CHARS * CHAR_WIDTH}\t0\t-1\t")
+        for line in range(1, 9):
+            line_words, positions, x = [], [], 0
+            while True:
+                word = rng.choice(vocabulary)
+                if x + len(word) * CHAR_WIDTH > LINE_WIDTH_CHARS * CHAR_WIDTH:
+                    break
+                line_words.append(word)
+                positions.append(x)
+                x += (len(word) + 1) * CHAR_WIDTH
+            add_line(line_words, positions, block, line)
+            words += len(line_words)
+        y += 2 * LINE_HEIGHT
+
+        # A three-column table
+        block += 1
+        rows.append(f"2\t1\t{block}\t0\t0\t0\t0\t{y}\t{LINE_WIDTH_CHARS * CHAR_WIDTH}\t0\t-1\t")
+        for line in range(1, 6):
+            cells = [rng.choice(vocabulary), str(rng.randint(1, 999)), f"{rng.random() * 100:.2f}"]
+            add_line(cells, [0, 30 * CHAR_WIDTH, 50 * CHAR_WIDTH], block, line)
+            words += len(cells)
+        y += 2 * LINE_HEIGHT
+    return '\n'.join(rows)
+
+
+def time_calls(fn, repeats):
+    """Median wall time of fn() in seconds, after one warm-up call"""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure post-processing throughput")
+    parser.add_argument('--repeats', type=int, default=5, help="timed runs per size")
+    parser.add_argument('--words', type=int, nargs='+', default=list(WORD_COUNTS),
+                        help="output sizes in words (default: %(default)s)")
+    args = parser.parse_args()
+
+    dictionary = {f"wrong{i}": f"right{i}" for i in range(1000)}
+    processor = PostProcessor(rules=tuple(RULE_SETS), dictionary=dictionary)
+
+    print_header(f"Post-processing throughput (median of {args.repeats})")
+    print(f"{'words':>8} {'chars':>9} {'layout ms':>10} {'clean ms':>9} {'total ms':>9} "
+          f"{'words/s':>11} {'MB/s':>7}")
+    for word_count in args.words:
+        result = parse_tsv(synthetic_tsv(word_count))
+        text = reconstruct_layout(result)
+        layout = time_calls(lambda: reconstruct_layout(result), args.repeats)
+        clean = time_calls(lambda: processor.clean(text), args.repeats)
+        total = layout + clean
+        megabytes = len(text.encode('utf-8')) / 1e6
+        print(f"{len(result):>8} {len(text):>9} {layout * 1000:>10.2f} {clean * 1000:>9.2f} "
+              f"{total * 1000:>9.2f} {len(result) / total:>11,.0f} {megabytes / total:>7.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
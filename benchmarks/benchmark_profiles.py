@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Profile Benchmark for Live Screen Text Extractor
+Runs every preprocessing profile over a corpus of labelled images and
+reports latency and character accuracy per profile, plus which profile
+the automatic selector picked for each image.
+
+The default corpus is synthetic (light, dark, gradient and noisy themes
+at several font sizes). --corpus DIR uses real screenshots instead: each
+image needs a .txt file with the same name holding its expected text.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from batch_ocr import IMAGE_EXTENSIONS  # noqa: E402
+from ocr_engine import create_engine, get_default_backend  # noqa: E402
+from ocr_pipeline import DEFAULT_OCR_CONFIG  # noqa: E402
+from preprocessing import PROFILES, Preprocessor, select_profile  # noqa: E402
+from synthetic_images import THEMES, character_accuracy, render_text_image  # noqa: E402
+
+FONT_SIZES = (9, 12, 18)
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def synthetic_corpus():
+    """Return (name, RGB array, expected text) for every theme and font size"""
+    corpus = []
+    for theme in THEMES:
+        for size in FONT_SIZES:
+            image, text = render_text_image(font_size=size, theme=theme)
+            corpus.append((f"{theme}-{size}px", np.asarray(image), text))
+    return corpus
+
+
+def load_corpus(directory):
+    """Return (name, RGB array, expected text) for labelled images in directory"""
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        label = path.with_suffix('.txt')
+        if path.suffix.lower() in IMAGE_EXTENSIONS and label.exists():
+            with Image.open(path) as image:
+                pixels = np.asarray(image.convert('RGB'))
+            corpus.append((path.name, pixels, label.read_text(encoding='utf-8')))
+    return corpus
+
+
+def benchmark_profile(profile, corpus, engine, iterations):
+    """Time one profile over the corpus
+
+    Returns:
+        Dict with median preprocessing and OCR latency (ms) and mean
+        character accuracy; OCR figures are None without an engine
+    """
+    preprocessor = Preprocessor()
+    prep_ms, ocr_ms, accuracy = [], [], []
+    for _, pixels, expected in corpus:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            binary = preprocessor.binarize(pixels, profile)
+            prep_ms.append((time.perf_counter() - start) * 1000)
+        if engine is None:
+            continue
+
+        start = time.perf_counter()
+        text = engine.recognize_array(binary, config=DEFAULT_OCR_CONFIG)
+        ocr_ms.append((time.perf_counter() - start) * 1000)
+        accuracy.append(character_accuracy(expected, text))
+
+    return {
+        'prep_ms': statistics.median(prep_ms),
+        'ocr_ms': statistics.median(ocr_ms) if ocr_ms else None,
+        'accuracy': statistics.mean(accuracy) if accuracy else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare preprocessing profiles")
+    parser.add_argument('--corpus', metavar='DIR',
+                        help="directory of images with matching .txt ground truth")
+    parser.add_argument('--iterations', type=int, default=20,
+                        help="preprocessing runs per image (OCR runs once)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not corpus:
+        print("No labelled images found")
+        return 1
+
+    try:
+        engine = create_engine(get_default_backend())
+        engine.recognize_array(Preprocessor().binarize(corpus[0][1]), config=DEFAULT_OCR_CONFIG)
+    except Exception as e:
+        print(f"OCR unavailable ({e}); reporting preprocessing latency only")
+        engine = None
+
+    print_header(f"Automatic selection ({len(corpus)} images)")
+    choices = Counter()
+    for name, pixels, _ in corpus:
+        start = time.perf_counter()
+        profile = select_profile(pixels)
+        elapsed = (time.perf_counter() - start) * 1000
+        choices[profile] += 1
+        print(f"{name:<24} {profile:<10} {elapsed:6.2f} ms")
+
+    print_header("Per-profile results")
+    print(f"{'profile':<10} {'prep ms':>9} {'ocr ms':>9} {'accuracy':>9}")
+    for profile in ('auto',) + PROFILES:
+        result = benchmark_profile(profile, corpus, engine, args.iterations)
+        ocr = f"{result['ocr_ms']:9.1f}" if result['ocr_ms'] is not None else f"{'n/a':>9}"
+        accuracy = f"{result['accuracy']:9.1%}" if result['accuracy'] is not None else f"{'n/a':>9}"
+        print(f"{profile:<10} {result['prep_ms']:9.2f} {ocr} {accuracy}")
+
+    print(f"\nauto picked: {', '.join(f'{p} x{n}' for p, n in choices.most_common())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
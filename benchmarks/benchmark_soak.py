@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Soak Benchmark for Live Screen Text Extractor
+Replays a long session of extractions and checks that resident memory
+stays flat. Every iteration cuts a random region out of a synthetic
+screen, OCRs it through the in-memory result cache, cleans the text and
+adds the result to an ExtractionHistory, which is what the control panel
+does for each extraction. RSS is sampled throughout; after a warm-up
+period its growth must stay under --max-growth-mb.
+
+--unbounded keeps every RGB crop and OCRResult in a list instead, which
+is how memory behaved when each extraction opened its own editor, for
+comparison. Recognition is skipped (and reported) without Tesseract; the
+Tk editor itself needs a display and is not exercised here.
+
+Examples:
+    python benchmarks/benchmark_soak.py --iterations 5000
+    python benchmarks/benchmark_soak.py --iterations 2000 --unbounded
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from extraction_history import ExtractionHistory, pack_image  # noqa: E402
+from metrics import process_memory  # noqa: E402
+from ocr_cache import OCRCache  # noqa: E402
+from ocr_pipeline import extract_data_from_image, warm_up  # noqa: E402
+from ocr_result import OCRResult  # noqa: E402
+from postprocessing import PostProcessor  # noqa: E402
+from synthetic_images import SAMPLE_LINES, THEMES, render_text_image  # noqa: E402
+
+SCREEN_SIZE = (1080, 1920)
+
+# Share of the run treated as warm-up (allocator pools, caches filling)
+WARM_UP_FRACTION = 0.2
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def synthetic_screen(seed=0):
+    """RGB frame the size of a full HD screen tiled with rendered text"""
+    rng = random.Random(seed)
+    screen = np.full(SCREEN_SIZE + (3,), 255, dtype=np.uint8)
+    y = 0
+    while y < SCREEN_SIZE[0]:
+        x = 0
+        tallest = 0
+        while x < SCREEN_SIZE[1]:
+            lines = rng.sample(SAMPLE_LINES, rng.randint(1, len(SAMPLE_LINES)))
+            image, _ = render_text_image(lines, font_size=rng.choice((12, 14, 18)),
+                                         theme=rng.choice(tuple(THEMES)),
+                                         seed=rng.randrange(2 ** 32))
+            tile = np.asarray(image)[:SCREEN_SIZE[0] - y, :SCREEN_SIZE[1] - x]
+            screen[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+            x += tile.shape[1]
+            tallest = max(tallest, tile.shape[0])
+        y += tallest
+    return screen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that memory stays flat over many extractions")
+    parser.add_argument('--iterations', type=int, default=3000,
+                        help="extractions to replay (default: %(default)s)")
+    parser.add_argument('--samples', type=int, default=30,
+                        help="memory samples over the run (default: %(default)s)")
+    parser.add_argument('--max-growth-mb', type=float, default=8.0,
+                        help="allowed RSS growth after warm-up (default: %(default)s)")
+    parser.add_argument('--unbounded', action='store_true',
+                        help="keep every crop and result, as separate editor windows did")
+    parser.add_argument('--no-ocr', action='store_true', help="skip recognition")
+    parser.add_argument('--output', metavar='FILE', help="write the samples as JSON")
+    args = parser.parse_args()
+
+    if process_memory() is None:
+        print("Cannot read this process's memory here; install psutil", file=sys.stderr)
+        return 1
+
+    ocr = not args.no_ocr
+    if ocr:
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"OCR unavailable ({e}); replaying without recognition", file=sys.stderr)
+            ocr = False
+
+    rng = random.Random(0)
+    screen = synthetic_screen()
+    cache = OCRCache()
+    history = ExtractionHistory()
+    processor = PostProcessor()
+    kept = []
+
+    sample_every = max(1, args.iterations // args.samples)
+    samples = []
+    start = time.perf_counter()
+    for iteration in range(1, args.iterations + 1):
+        height, width = rng.randint(40, 600), rng.randint(80, 1200)
+        top = rng.randint(0, SCREEN_SIZE[0] - height)
+        left = rng.randint(0, SCREEN_SIZE[1] - width)
+        bbox = (left, top, left + width, top + height)
+        # The control panel copies the crop out of the frozen frame
+        crop = screen[top:top + height, left:left + width].copy()
+
+        result = extract_data_from_image(crop, cache=cache) if ocr else OCRResult.empty()
+        text = processor(result)
+        if args.unbounded:
+            kept.append((crop, result, text))
+        else:
+            history.add(text, pack_image(crop), bbox)
+        del crop, result
+
+        if iteration % sample_every == 0 or iteration == args.iterations:
+            samples.append((iteration, process_memory()))
+
+    elapsed = time.perf_counter() - start
+    warm = [rss for iteration, rss in samples if iteration > args.iterations * WARM_UP_FRACTION]
+    growth_mb = (warm[-1] - warm[0]) / 1048576 if len(warm) > 1 else 0.0
+
+    print_header(f"Soak: {args.iterations} extractions"
+                 + (" (unbounded)" if args.unbounded else "")
+                 + ("" if ocr else " without OCR"))
+    for iteration, rss in samples[::max(1, len(samples) // 10)]:
+        print(f"{iteration:>8}  {rss / 1048576:8.1f} MB")
+    print(f"\nextractions/s:   {args.iterations / elapsed:.1f}")
+    print(f"history:         {len(history)} entries, {history.nbytes / 1024:.0f} KB, "
+          f"{history.evicted} evicted")
+    print(f"growth after warm-up: {growth_mb:+.1f} MB (limit {args.max_growth_mb} MB)")
+
+    if args.output:
+        report = {'iterations': args.iterations, 'ocr': ocr, 'unbounded': args.unbounded,
+                  'growth_mb': round(growth_mb, 2),
+                  'samples': [{'iteration': i, 'rss_bytes': rss} for i, rss in samples]}
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+
+    if growth_mb > args.max_growth_mb:
+        print("FAIL: memory kept growing", file=sys.stderr)
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
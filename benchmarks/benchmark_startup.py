@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for Live Screen Text Extractor
+Imports the GUI module in fresh interpreters and reports how long that
+takes, and whether any heavy dependency was loaded that should have
+been deferred until after the control panel is shown.
+
+Exits with status 1 when a heavy module is imported eagerly or the
+median import time is above --max-ms, so it can guard releases.
+
+The GUI itself records the time until the panel is on screen ('startup')
+and until OCR is ready ('ocr_ready') in the Stats pane.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported before the panel appears
+HEAVY_MODULES = ('numpy', 'cv2', 'PIL', 'pytesseract', 'tesserocr', 'mss')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'ms': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def print_header(title):
+    """Print a formatted header"""
+    print(f"\n{'='*50}")
+    print(f" {title}")
+    print(f"{'='*50}")
+
+
+def measure_import(module, runs):
+    """Import module in runs fresh interpreters
+
+    Returns:
+        (list of import times in ms, heavy modules seen after import)
+    """
+    timings = []
+    heavy = set()
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=str(PROJECT_DIR),
+                                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['ms'])
+        heavy.update(result['heavy'])
+    return timings, sorted(heavy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure control panel import time")
+    parser.add_argument('--runs', type=int, default=10, help="fresh interpreters to start")
+    parser.add_argument('--max-ms', type=float, default=150.0,
+                        help="fail when the median import time exceeds this (default: %(default)s)")
+    args = parser.parse_args()
+
+    print_header(f"Import time of screen_text_extractor ({args.runs} runs)")
+    timings, heavy = measure_import('screen_text_extractor', args.runs)
+    median = statistics.median(timings)
+    print(f"median {median:8.1f} ms   min {min(timings):8.1f} ms   max {max(timings):8.1f} ms")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: imported eagerly: {', '.join(heavy)}")
+        failed = True
+    if median > args.max_ms:
+        print(f"FAIL: median above {args.max_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Synthetic text images for the benchmark scripts
+Renders known text with PIL so benchmarks run offline and are repeatable.
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+SAMPLE_LINES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "ERROR 404: resource /api/v1/items not found",
+    "Total: 1,284.50 EUR  (VAT 19% included)",
+    "Connection established at 12:34:56 on port 8080",
+]
+
+
+# Font families the benchmarks render with, when installed
+FONT_NAMES = ("DejaVuSans.ttf", "DejaVuSansMono.ttf", "DejaVuSerif.ttf")
+
+
+def load_font(size, name=None):
+    """Load a TrueType font at the given size, falling back to PIL's default
+
+    Args:
+        size: Font size in pixels
+        name: Font file to try first, e.g. one of FONT_NAMES
+    """
+    candidates = ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf", "LiberationSans-Regular.ttf")
+    for name in ((name,) if name else ()) + candidates:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+# Background and text colours; gradient and noisy are post-processed
+THEMES = {
+    'light': ((255, 255, 255), (0, 0, 0)),
+    'dark': ((30, 30, 30), (220, 220, 220)),
+    'gradient': ((255, 255, 255), (20, 20, 60)),
+    'noisy': ((235, 235, 235), (10, 10, 10)),
+}
+
+
+def render_text_image(lines=None, font_size=18, padding=10, theme='light', seed=0, font_name=None):
+    """Render lines of text in one of THEMES
+
+    Args:
+        lines: Lines to draw; defaults to SAMPLE_LINES
+        font_size: Font size in pixels
+        padding: Margin around the text
+        theme: Key of THEMES
+        seed: Seed for the noise added by the 'noisy' theme
+        font_name: Font file to render with, see load_font()
+
+    Returns:
+        Tuple of (RGB PIL Image, the text that was rendered)
+    """
+    lines = lines or SAMPLE_LINES
+    font = load_font(font_size, font_name)
+    line_height = int(font_size * 1.5)
+    width = max(int(font.getlength(line)) for line in lines) + 2 * padding
+    height = line_height * len(lines) + 2 * padding
+    background, foreground = THEMES[theme]
+
+    image = Image.new('RGB', (width, height), background)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((padding, padding + i * line_height), line, fill=foreground, font=font)
+
+    if theme == 'gradient':
+        # Light on the left fading to mid-grey on the right
+        pixels = np.asarray(image).astype(np.float32)
+        pixels *= np.linspace(1.0, 0.45, width, dtype=np.float32)[None, :, None]
+        image = Image.fromarray(pixels.astype(np.uint8))
+    elif theme == 'noisy':
+        rng = np.random.default_rng(seed)
+        pixels = np.asarray(image).astype(np.int16)
+        pixels += rng.normal(0, 18, pixels.shape[:2]).astype(np.int16)[:, :, None]
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image, "\n".join(lines)
+
+
+def character_accuracy(expected, actual):
+    """Share of expected characters recognised correctly (1 - CER)
+
+    Uses the Levenshtein distance over the texts with whitespace runs
+    collapsed, so layout differences are not counted as errors.
+    """
+    expected = ' '.join(expected.split())
+    actual = ' '.join((actual or '').split())
+    if not expected:
+        return 1.0 if not actual else 0.0
+
+    previous = list(range(len(actual) + 1))
+    for i, a in enumerate(expected, 1):
+        current = [i]
+        for j, b in enumerate(actual, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a != b)))
+        previous = current
+    return max(0.0, 1.0 - previous[-1] / len(expected))
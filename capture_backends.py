@@ -0,0 +1,353 @@
+"""
+Screen capture backends for Live Screen Text Extractor
+PIL.ImageGrab is slow on Linux and returns a PIL image that then has to
+be copied into NumPy. The backends here return RGB NumPy arrays directly.
+On X11 the XShm backend reuses one MIT-SHM segment between grabs, so
+repeated captures of a region (watch mode, batch regions) avoid both the
+X socket transfer and a fresh allocation per frame.
+
+Backends, in order of preference:
+    xshm       - XShmGetImage through ctypes (Linux/X11 only)
+    mss        - the mss package, if installed
+    imagegrab  - PIL.ImageGrab, always available
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+from PIL import ImageGrab
+
+
+class CaptureError(Exception):
+    """Raised when a capture backend cannot be used"""
+
+
+class CaptureBackend:
+    """Common interface for screen grabbers"""
+
+    name = None
+
+    def grab(self, bbox=None):
+        """Capture (x1, y1, x2, y2), or the whole screen, as an RGB array"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class ImageGrabBackend(CaptureBackend):
+    """Fallback backend using PIL.ImageGrab"""
+
+    name = 'imagegrab'
+
+    def grab(self, bbox=None):
+        image = ImageGrab.grab(bbox=tuple(bbox) if bbox else None)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return np.asarray(image)
+
+
+class MSSBackend(CaptureBackend):
+    """Backend using the mss package (Windows, macOS and X11)"""
+
+    name = 'mss'
+
+    def __init__(self):
+        try:
+            import mss
+        except ImportError as e:
+            raise CaptureError(f"mss is not installed: {e}")
+        # mss instances hold per-thread OS handles; one per backend instance
+        self._sct = mss.mss()
+
+    def grab(self, bbox=None):
+        if bbox:
+            x1, y1, x2, y2 = bbox
+            monitor = {'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1}
+        else:
+            monitor = self._sct.monitors[0]
+        shot = self._sct.grab(monitor)
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+
+    def close(self):
+        self._sct.close()
+
+
+class _XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; only ever accessed through a pointer
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int),
+        ('red_mask', ctypes.c_ulong),
+        ('green_mask', ctypes.c_ulong),
+        ('blue_mask', ctypes.c_ulong),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int),
+    ]
+
+
+_ZPIXMAP = 2
+_ALL_PLANES = 0xFFFFFFFF
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+_x_errors = []
+_x_error_lock = threading.Lock()
+
+
+@_X_ERROR_HANDLER
+def _record_x_error(display, event):
+    # Xlib's default handler exits the process; record the error instead
+    _x_errors.append(event)
+    return 0
+
+
+def _load_xlibs():
+    """Load libX11, libXext and libc with the prototypes we use"""
+    names = {'X11': ctypes.util.find_library('X11'),
+             'Xext': ctypes.util.find_library('Xext'),
+             'c': ctypes.util.find_library('c')}
+    if not all(names.values()):
+        raise CaptureError("X11/Xext libraries not found")
+    x11, xext, libc = (ctypes.CDLL(names[key]) for key in ('X11', 'Xext', 'c'))
+
+    ptr = ctypes.c_void_p
+    x11.XOpenDisplay.restype = ptr
+    x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    x11.XCloseDisplay.argtypes = [ptr]
+    x11.XDefaultScreen.argtypes = [ptr]
+    x11.XRootWindow.restype = ctypes.c_ulong
+    x11.XRootWindow.argtypes = [ptr, ctypes.c_int]
+    x11.XDefaultVisual.restype = ptr
+    x11.XDefaultVisual.argtypes = [ptr, ctypes.c_int]
+    x11.XDefaultDepth.argtypes = [ptr, ctypes.c_int]
+    x11.XDisplayWidth.argtypes = [ptr, ctypes.c_int]
+    x11.XDisplayHeight.argtypes = [ptr, ctypes.c_int]
+    x11.XSync.argtypes = [ptr, ctypes.c_int]
+    x11.XSetErrorHandler.restype = ptr
+    x11.XSetErrorHandler.argtypes = [ptr]
+    x11.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+
+    xext.XShmQueryExtension.argtypes = [ptr]
+    xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+    xext.XShmCreateImage.argtypes = [ptr, ptr, ctypes.c_uint, ctypes.c_int, ptr,
+                                     ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint]
+    xext.XShmAttach.argtypes = [ptr, ctypes.POINTER(_XShmSegmentInfo)]
+    xext.XShmDetach.argtypes = [ptr, ctypes.POINTER(_XShmSegmentInfo)]
+    xext.XShmGetImage.argtypes = [ptr, ctypes.c_ulong, ctypes.POINTER(_XImage),
+                                  ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+
+    libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+    libc.shmat.restype = ptr
+    libc.shmat.argtypes = [ctypes.c_int, ptr, ctypes.c_int]
+    libc.shmdt.argtypes = [ptr]
+    libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ptr]
+    return x11, xext, libc
+
+
+class XShmBackend(CaptureBackend):
+    """X11 backend reading the screen through a reused MIT-SHM segment"""
+
+    name = 'xshm'
+
+    def __init__(self):
+        if not sys.platform.startswith('linux') or not os.environ.get('DISPLAY'):
+            raise CaptureError("XShm capture needs an X11 display")
+        self._x11, self._xext, self._libc = _load_xlibs()
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise CaptureError("Cannot open X display")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._x11.XCloseDisplay(self._display)
+            raise CaptureError("X server does not support MIT-SHM")
+
+        screen = self._x11.XDefaultScreen(self._display)
+        self._root = self._x11.XRootWindow(self._display, screen)
+        self._visual = self._x11.XDefaultVisual(self._display, screen)
+        self._depth = self._x11.XDefaultDepth(self._display, screen)
+        self.screen_size = (self._x11.XDisplayWidth(self._display, screen),
+                            self._x11.XDisplayHeight(self._display, screen))
+
+        self._image = None
+        self._shminfo = None
+        self._size = None
+        self._frame = None
+
+    @contextmanager
+    def _trap_x_errors(self):
+        """Collect X errors raised inside the block instead of exiting
+
+        The handler is process-wide (Tk shares it), so the previous one is
+        restored as soon as the block ends.
+        """
+        with _x_error_lock:
+            del _x_errors[:]
+            previous = self._x11.XSetErrorHandler(ctypes.cast(_record_x_error, ctypes.c_void_p))
+            try:
+                yield _x_errors
+            finally:
+                self._x11.XSync(self._display, 0)
+                self._x11.XSetErrorHandler(previous)
+
+    def _attach(self, width, height):
+        """Create the shared-memory XImage for a given capture size"""
+        self._release_segment()
+
+        shminfo = _XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(self._display, self._visual, self._depth, _ZPIXMAP,
+                                           None, ctypes.byref(shminfo), width, height)
+        if not image:
+            raise CaptureError("XShmCreateImage failed")
+        if image.contents.bits_per_pixel != 32:
+            self._x11.XDestroyImage(image)
+            raise CaptureError("Only 32 bits-per-pixel visuals are supported")
+
+        size = image.contents.bytes_per_line * height
+        shminfo.shmid = self._libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if shminfo.shmid < 0:
+            self._x11.XDestroyImage(image)
+            raise CaptureError("shmget failed")
+        shminfo.shmaddr = self._libc.shmat(shminfo.shmid, None, 0)
+        image.contents.data = shminfo.shmaddr
+        shminfo.readOnly = 0
+
+        with self._trap_x_errors() as errors:
+            attached = self._xext.XShmAttach(self._display, ctypes.byref(shminfo))
+        # The segment is freed automatically once both sides detach
+        self._libc.shmctl(shminfo.shmid, _IPC_RMID, None)
+        if not attached or errors:
+            self._libc.shmdt(shminfo.shmaddr)
+            self._x11.XDestroyImage(image)
+            raise CaptureError("XShmAttach failed (remote X display?)")
+
+        self._image, self._shminfo, self._size = image, shminfo, (width, height)
+        bytes_per_line = image.contents.bytes_per_line
+        buffer = (ctypes.c_ubyte * size).from_address(shminfo.shmaddr)
+        self._frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, bytes_per_line)
+
+    def grab(self, bbox=None):
+        x1, y1, x2, y2 = bbox if bbox else (0, 0) + self.screen_size
+        width, height = x2 - x1, y2 - y1
+        if x1 < 0 or y1 < 0 or x2 > self.screen_size[0] or y2 > self.screen_size[1]:
+            raise ValueError(f"Region {bbox} is outside the {self.screen_size} screen")
+        if self._size != (width, height):
+            self._attach(width, height)
+
+        with self._trap_x_errors() as errors:
+            grabbed = self._xext.XShmGetImage(self._display, self._root, self._image,
+                                              x1, y1, _ALL_PLANES)
+        if not grabbed or errors:
+            raise CaptureError("XShmGetImage failed")
+
+        # The segment is overwritten by the next grab, so the colour
+        # conversion doubles as the copy out of shared memory
+        bgra = self._frame[:, :width * 4].reshape(height, width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+
+    def _release_segment(self):
+        if self._image is not None:
+            self._xext.XShmDetach(self._display, ctypes.byref(self._shminfo))
+            self._x11.XDestroyImage(self._image)
+            self._libc.shmdt(self._shminfo.shmaddr)
+            self._image = self._shminfo = self._size = None
+            self._frame = None
+
+    def close(self):
+        if self._display:
+            self._release_segment()
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+CAPTURE_BACKENDS = {
+    XShmBackend.name: XShmBackend,
+    MSSBackend.name: MSSBackend,
+    ImageGrabBackend.name: ImageGrabBackend,
+}
+
+# Backends tried, in order, when no backend is requested explicitly
+CAPTURE_PREFERENCE = ('xshm', 'mss', 'imagegrab')
+
+
+def create_capture_backend(backend=None):
+    """Create a capture backend
+
+    Args:
+        backend: Name from CAPTURE_BACKENDS, or None to pick the first
+            one that loads from CAPTURE_PREFERENCE
+
+    Raises:
+        CaptureError: If the requested backend cannot be initialised
+    """
+    if backend is not None:
+        if backend not in CAPTURE_BACKENDS:
+            raise CaptureError(f"Unknown capture backend '{backend}'")
+        return CAPTURE_BACKENDS[backend]()
+
+    for name in CAPTURE_PREFERENCE:
+        try:
+            return CAPTURE_BACKENDS[name]()
+        except (CaptureError, OSError):
+            continue
+    return ImageGrabBackend()
+
+
+_default_capture_backend = None
+_thread_backends = threading.local()
+
+
+def set_default_capture_backend(backend):
+    """Choose the backend used by get_capture_backend(); None auto-selects"""
+    global _default_capture_backend
+    if backend is not None and backend not in CAPTURE_BACKENDS:
+        raise CaptureError(f"Unknown capture backend '{backend}'")
+    _default_capture_backend = backend
+
+
+def get_capture_backend():
+    """Return this thread's capture backend, creating it on first use
+
+    X displays and mss handles must not be shared between threads, so
+    every thread gets its own backend (and its own shared-memory segment).
+    """
+    backends = getattr(_thread_backends, 'backends', None)
+    if backends is None:
+        backends = _thread_backends.backends = {}
+
+    backend = backends.get(_default_capture_backend)
+    if backend is None:
+        backend = backends[_default_capture_backend] = create_capture_backend(_default_capture_backend)
+    return backend
@@ -0,0 +1,121 @@
+"""
+Extraction history for Live Screen Text Extractor
+Keeps the most recent extractions of a session so earlier results can be
+brought back after the editor has moved on. Crops are stored binarised,
+with eight pixels packed into each byte (np.packbits), so an entry
+costs about 1/24 of the RGB crop and can still be OCR'd again. The history
+is bounded both by entry count and by bytes, and evicts the oldest
+entries first, so a session running all day keeps a flat footprint.
+"""
+
+import time
+from collections import deque, namedtuple
+
+import cv2
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 50
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# A binarised image with one bit per pixel; shape is the unpacked (height, width)
+PackedImage = namedtuple('PackedImage', ['bits', 'shape'])
+
+# One remembered extraction; bbox and image are None when unknown
+HistoryEntry = namedtuple('HistoryEntry', ['timestamp', 'text', 'bbox', 'image'])
+
+
+def pack_image(image):
+    """Binarise an image with an Otsu threshold and pack it to one bit per pixel
+
+    Args:
+        image: RGB(A) or grayscale NumPy array or PIL Image
+
+    Returns:
+        PackedImage; set bits are the lighter side of the threshold
+    """
+    pixels = np.asarray(image)
+    if pixels.ndim == 3:
+        code = cv2.COLOR_RGBA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        pixels = cv2.cvtColor(pixels, code)
+    _, binary = cv2.threshold(pixels, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return PackedImage(np.packbits(binary > 127, axis=None), binary.shape)
+
+
+def unpack_image(packed):
+    """Restore a PackedImage as a uint8 array of 0/255 values, ready for OCR"""
+    height, width = packed.shape
+    bits = np.unpackbits(packed.bits, count=height * width)
+    return bits.reshape(height, width) * np.uint8(255)
+
+
+def entry_size(entry):
+    """Approximate bytes held by a HistoryEntry"""
+    size = len(entry.text.encode('utf-8'))
+    if entry.image is not None:
+        size += entry.image.bits.nbytes
+    return size
+
+
+class ExtractionHistory:
+    """Bounded, oldest-first list of recent extractions
+
+    Not thread-safe: the control panel adds and reads entries on the Tk
+    thread only. Pack images with pack_image() on a worker first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Entries kept; older ones are evicted
+            max_bytes: Budget for text and packed images together; the
+                newest entry is always kept, even if it alone exceeds it
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evicted = 0
+        self._entries = deque()
+        self._bytes = 0
+
+    def add(self, text, image=None, bbox=None, timestamp=None):
+        """Remember an extraction and evict the oldest ones over the limits
+
+        Args:
+            text: Extracted text
+            image: PackedImage of the crop, or None
+            bbox: (x1, y1, x2, y2) screen box of the crop, or None
+            timestamp: Unix time; defaults to now
+
+        Returns:
+            The new HistoryEntry
+        """
+        entry = HistoryEntry(time.time() if timestamp is None else timestamp, text,
+                             tuple(bbox) if bbox else None, image)
+        self._entries.append(entry)
+        self._bytes += entry_size(entry)
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self._bytes > self.max_bytes):
+            self._bytes -= entry_size(self._entries.popleft())
+            self.evicted += 1
+        return entry
+
+    @property
+    def nbytes(self):
+        """Bytes currently held by the entries, as counted by entry_size()"""
+        return self._bytes
+
+    def latest(self):
+        """Newest entry, or None when the history is empty"""
+        return self._entries[-1] if self._entries else None
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def __iter__(self):
+        return iter(list(self._entries))
@@ -0,0 +1,85 @@
+"""
+Global hotkeys for Live Screen Text Extractor
+Registers a system-wide key combination through the optional pynput
+package, so quick extraction works while another application has focus.
+Without pynput (or without a display it can hook) the control panel
+falls back to a Tk binding that only fires while the panel is focused.
+
+Combinations use pynput's syntax, e.g. '<ctrl>+<alt>+e'.
+"""
+
+import time
+
+# Capture the last region, OCR it and copy the text to the clipboard
+QUICK_EXTRACT_HOTKEY = '<ctrl>+<alt>+e'
+
+_TK_MODIFIERS = {
+    'ctrl': 'Control',
+    'alt': 'Alt',
+    'shift': 'Shift',
+    'cmd': 'Command',
+}
+
+
+class HotkeyError(Exception):
+    """Raised when a global hotkey cannot be registered"""
+
+
+def tk_sequence(combo):
+    """Translate a pynput combination into a Tk event sequence
+
+    Example:
+        tk_sequence('<ctrl>+<alt>+e') == '<Control-Alt-KeyPress-e>'
+    """
+    parts = []
+    for key in combo.split('+'):
+        key = key.strip()
+        if key.startswith('<') and key.endswith('>'):
+            name = key[1:-1]
+            parts.append(_TK_MODIFIERS.get(name, name))
+        else:
+            parts.append(f"KeyPress-{key}")
+    return '<' + '-'.join(parts) + '>'
+
+
+class GlobalHotkey:
+    """System-wide hotkey calling callback(pressed_at) on a listener thread
+
+    pressed_at is the time.perf_counter() value taken as the key event
+    arrives, so callers can measure latency from the keypress itself.
+    Keep the callback short; hand work to another thread or queue.
+    """
+
+    def __init__(self, combo, callback):
+        self.combo = combo
+        self.callback = callback
+        self._listener = None
+
+    def start(self):
+        """Register the hotkey; raises HotkeyError if that is not possible"""
+        try:
+            from pynput import keyboard
+        except Exception as e:
+            # pynput raises ImportError, or other errors without a display
+            raise HotkeyError(f"pynput is not available: {e}")
+
+        def on_activate():
+            self.callback(time.perf_counter())
+
+        try:
+            self._listener = keyboard.GlobalHotKeys({self.combo: on_activate})
+            self._listener.daemon = True
+            self._listener.start()
+        except Exception as e:
+            self._listener = None
+            raise HotkeyError(f"cannot register {self.combo}: {e}")
+
+    def stop(self):
+        """Unregister the hotkey"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    @property
+    def running(self):
+        return self._listener is not None
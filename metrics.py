@@ -0,0 +1,185 @@
+"""
+Timing instrumentation for Live Screen Text Extractor
+Low-overhead per-stage timers and counters for capture, preprocessing and
+OCR. One Metrics instance is shared by the whole process (get_metrics()):
+the control panel's stats pane reads it, the CLI exports it as JSON, and
+hooks hand every measurement to headless callers as it is taken.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Recent samples kept per stage for the percentiles
+SAMPLE_WINDOW = 512
+
+
+class StageStats:
+    """Running totals and a window of recent timings for one stage"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'last_ms', 'samples')
+
+    def __init__(self, window):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.samples = deque(maxlen=window)
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.samples.append(elapsed_ms)
+
+    def summary(self):
+        """Dict of count, mean, p50, p95, max and last latency in ms"""
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(_percentile(ordered, 0.50), 3),
+            'p95_ms': round(_percentile(ordered, 0.95), 3),
+            'max_ms': round(self.max_ms, 3),
+            'last_ms': round(self.last_ms, 3),
+        }
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Metrics:
+    """Thread-safe registry of stage timings and event counters
+
+    Recording costs two perf_counter() calls and a short lock, so timers
+    can stay on in production. Hooks are called as hook(stage, elapsed_ms)
+    on the thread that did the work, after the lock is released; keep them
+    fast.
+    """
+
+    def __init__(self, window=SAMPLE_WINDOW):
+        self.window = window
+        self._stages = {}
+        self._counters = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, elapsed_ms):
+        """Add one timing for stage, in milliseconds"""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(self.window)
+            stats.add(elapsed_ms)
+            hooks = self._hooks
+        for hook in hooks:
+            hook(stage, elapsed_ms)
+
+    @contextmanager
+    def timer(self, stage):
+        """Context manager timing its block as one sample of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def increment(self, counter, amount=1):
+        """Add amount to a named event counter"""
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def add_hook(self, hook):
+        """Call hook(stage, elapsed_ms) for every timing from now on"""
+        with self._lock:
+            # Copy on write so record() can iterate without the lock
+            self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook):
+        """Stop calling a hook added with add_hook()"""
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def snapshot(self):
+        """Return {'stages': {stage: summary}, 'counters': {name: value}}"""
+        with self._lock:
+            return {
+                'stages': {stage: stats.summary() for stage, stats in self._stages.items()},
+                'counters': dict(self._counters),
+            }
+
+    def to_json(self, indent=None):
+        """Serialise snapshot() as JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def reset(self):
+        """Drop all timings and counters; hooks stay registered"""
+        with self._lock:
+            self._stages = {}
+            self._counters = {}
+
+
+def json_log_hook(stream=None):
+    """Return a hook that writes each timing to stream as one JSON line
+
+    Example:
+        get_metrics().add_hook(json_log_hook(sys.stderr))
+    """
+    def hook(stage, elapsed_ms):
+        out = stream or sys.stderr
+        out.write(json.dumps({'ts': round(time.time(), 3), 'stage': stage,
+                              'ms': round(elapsed_ms, 3)}) + '\n')
+    return hook
+
+
+def process_memory():
+    """Resident memory of this process in bytes, or None where it cannot be read
+
+    Uses psutil when it is installed, /proc on Linux and the process
+    memory counters on Windows.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Return the process-wide Metrics instance"""
+    return _metrics
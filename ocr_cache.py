@@ -0,0 +1,182 @@
+"""
+OCR result cache for Live Screen Text Extractor
+Results are keyed by a hash of the preprocessed image plus the OCR
+settings, so re-cropping the same dialog or label skips Tesseract
+entirely. A bounded in-memory LRU sits in front of an optional SQLite
+tier that survives restarts.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def default_cache_path():
+    """Location of the on-disk cache the GUI uses once it is turned on"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'screen_text_extractor', 'ocr_cache.sqlite3')
+
+
+class OCRCache:
+    """Content-addressed OCR result cache with LRU eviction
+
+    Counters (hits, misses, evictions, ...) are plain attributes and can
+    be read at any time; stats() returns them together as a dict.
+    """
+
+    def __init__(self, max_entries=256, disk_path=None, max_disk_entries=10000):
+        """
+        Args:
+            max_entries: Results kept in memory
+            disk_path: SQLite file for the persistent tier, or None to
+                keep the cache in memory only
+            max_disk_entries: Rows kept on disk before the oldest are pruned
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._pending_prune = 0
+        self.disk_path = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if disk_path:
+            self.open_disk(disk_path)
+
+    def open_disk(self, path):
+        """Add (or switch to) the SQLite tier at path"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Workers share the connection; every access goes through self._lock
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS ocr_results ("
+                   "key BLOB PRIMARY KEY, text TEXT NOT NULL)")
+        db.commit()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = db
+            self.disk_path = path
+
+    def remove_disk(self):
+        """Close the disk tier and delete its files; memory entries stay"""
+        with self._lock:
+            path, self.disk_path = self.disk_path, None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        if path:
+            for name in (path, path + '-wal', path + '-shm'):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    @staticmethod
+    def make_key(pixels, config='', lang=''):
+        """Build a cache key from a preprocessed image and OCR settings
+
+        Args:
+            pixels: Preprocessed image as a NumPy array
+            config: Tesseract configuration string
+            lang: Tesseract language code
+
+        Returns:
+            bytes key
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{pixels.shape}|{pixels.dtype}|{config}|{lang}|".encode('utf-8'))
+        digest.update(memoryview(pixels).cast('B') if pixels.flags.c_contiguous else pixels.tobytes())
+        return digest.digest()
+
+    def get(self, key):
+        """Return the cached text for key, or None on a miss"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self._db is not None:
+                row = self._db.execute("SELECT text FROM ocr_results WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, row[0])
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        """Store the text recognised for key in both tiers"""
+        with self._lock:
+            self._remember(key, text)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO ocr_results (key, text) VALUES (?, ?)",
+                                 (key, text))
+                self._db.commit()
+                self._pending_prune += 1
+                if self._pending_prune >= 100:
+                    self._prune_disk()
+
+    def _remember(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_disk(self):
+        """Delete the oldest rows once the disk tier is over its limit"""
+        self._pending_prune = 0
+        count = self._db.execute("SELECT COUNT(*) FROM ocr_results").fetchone()[0]
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute("DELETE FROM ocr_results WHERE rowid IN "
+                             "(SELECT rowid FROM ocr_results ORDER BY rowid LIMIT ?)", (excess,))
+            self._db.commit()
+            self.disk_evictions += excess
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return the cache counters as a dict"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Drop every cached result, including the disk tier"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM ocr_results")
+                self._db.commit()
+
+    def close(self):
+        """Close the disk tier; the in-memory tier keeps working"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            self.disk_path = None
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Headless command line interface for Live Screen Text Extractor
+Extracts text from screen regions and image files without a GUI and
+without importing tkinter. Each result is written to stdout as one JSON
+object per line (JSON Lines).
+
+Examples:
+    python ocr_cli.py --bbox 100,200,600,400
+    python ocr_cli.py screenshots/ --workers 4 > results.jsonl
+    python ocr_cli.py archive/ --processes --checkpoint archive.done > archive.jsonl
+    python ocr_cli.py screenshots/ --metrics - > results.jsonl
+    python ocr_cli.py --bbox 0,0,800,600 --record chat.ocrlog --duration 3600
+    python ocr_cli.py scans/ --layout --fix letters,numbers,urls --dictionary fixes.txt
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_ocr import Checkpoint, iter_image_paths, run_batch
+from metrics import get_metrics, json_log_hook
+from ocr_cache import OCRCache
+from ocr_engine import (AUTO_LANGUAGE, DEFAULT_LANGUAGE, DEFAULT_OEM, ENGINE_BACKENDS, OEM_MODES,
+                        set_default_backend)
+from ocr_executor import default_worker_count
+from ocr_pipeline import DEFAULT_OCR_CONFIG, extract_text_from_screen
+from postprocessing import RULE_SETS, PostProcessor
+from preprocessing import DEFAULT_PROFILE, PROFILES
+from region_monitor import DEFAULT_WATCH_INTERVAL
+
+
+def parse_bbox(value):
+    """Parse 'x1,y1,x2,y2' into a tuple of ints"""
+    try:
+        x1, y1, x2, y2 = (int(part) for part in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected x1,y1,x2,y2 but got '{value}'")
+    if x2 <= x1 or y2 <= y1:
+        raise argparse.ArgumentTypeError(f"empty region '{value}'")
+    return x1, y1, x2, y2
+
+
+def parse_rules(value):
+    """Parse a comma-separated list of RULE_SETS names"""
+    rules = tuple(name.strip() for name in value.split(',') if name.strip())
+    unknown = [name for name in rules if name not in RULE_SETS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown rules {', '.join(unknown)} (choose from {', '.join(sorted(RULE_SETS))})")
+    return rules
+
+
+def build_parser():
+    """Create the argument parser for the headless CLI"""
+    parser = argparse.ArgumentParser(
+        prog='screen-text-extractor',
+        description="Extract text from screen regions or image files and print JSON Lines. "
+                    "Run without arguments to open the floating control panel.")
+    parser.add_argument('paths', nargs='*', help="image files or directories to OCR")
+    parser.add_argument('--bbox', action='append', type=parse_bbox, default=[],
+                        metavar='X1,Y1,X2,Y2', help="screen region to capture (repeatable)")
+    parser.add_argument('--workers', type=int, default=default_worker_count(),
+                        help="number of parallel OCR workers (default: %(default)s)")
+    parser.add_argument('--config', default=DEFAULT_OCR_CONFIG,
+                        help="Tesseract options (default: '%(default)s')")
+    parser.add_argument('--backend', choices=sorted(ENGINE_BACKENDS),
+                        help="OCR backend (default: fastest available)")
+    parser.add_argument('--profile', choices=('auto',) + PROFILES, default=DEFAULT_PROFILE,
+                        help="preprocessing profile (default: %(default)s)")
+    parser.add_argument('--lang', default=DEFAULT_LANGUAGE,
+                        help=f"Tesseract language, e.g. deu, chi_sim or eng+deu; '{AUTO_LANGUAGE}' "
+                             "detects the script with OSD first (default: %(default)s)")
+    parser.add_argument('--oem', choices=sorted(OEM_MODES), default='default',
+                        help="Tesseract OCR engine mode (default: %(default)s)")
+    parser.add_argument('--layout', action='store_true',
+                        help="rebuild paragraphs, hyphenated words and table columns from word boxes")
+    parser.add_argument('--fix', type=parse_rules, metavar='RULES',
+                        help=f"comma-separated correction rules: {', '.join(sorted(RULE_SETS))}")
+    parser.add_argument('--dictionary', metavar='FILE',
+                        help="word corrections, one 'wrong<TAB>right' pair per line")
+    parser.add_argument('--no-cache', action='store_true', help="disable the OCR result cache")
+    parser.add_argument('--processes', action='store_true',
+                        help="OCR image files on a process pool (best for large folders)")
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help="record finished files here and skip them when re-run")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="write per-stage timings and counters as JSON when done ('-' for stderr); "
+                             "not collected from --processes workers")
+    parser.add_argument('--trace', action='store_true',
+                        help="log every stage timing to stderr as a JSON line")
+    parser.add_argument('--record', metavar='FILE',
+                        help="watch the single --bbox region and record its text changes to FILE "
+                             "until --duration or Ctrl+C")
+    parser.add_argument('--duration', type=float, metavar='SECONDS',
+                        help="stop --record after this long (default: until interrupted)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help="seconds between --record captures (default: %(default)s)")
+    return parser
+
+
+def capture_record(bbox, config, cache, profile=DEFAULT_PROFILE, lang=DEFAULT_LANGUAGE,
+                   oem=DEFAULT_OEM, postprocessor=None):
+    """Capture and OCR one screen region and return its JSON record"""
+    record = {'source': 'screen', 'bbox': list(bbox)}
+    start = time.perf_counter()
+    try:
+        record['text'] = extract_text_from_screen(bbox, config, cache=cache, profile=profile,
+                                                  lang=lang, oem=oem, postprocessor=postprocessor)
+        record['error'] = None
+    except Exception as e:
+        record['text'] = None
+        record['error'] = str(e)
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+def record_region(bbox, path, interval=DEFAULT_WATCH_INTERVAL, duration=None,
+                  lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Record the text changes of a screen region to path
+
+    Runs until duration seconds have passed or Ctrl+C, then returns a
+    summary dict of records written, duplicates skipped and capture errors.
+    """
+    from region_monitor import RegionMonitor, TiledOCR
+    from text_recorder import TextRecorder
+
+    errors = [0]
+
+    def on_error(e):
+        errors[0] += 1
+
+    with TextRecorder(path) as recorder:
+        monitor = RegionMonitor(bbox, on_event=recorder.record_event, interval=interval,
+                                extract=TiledOCR(lang=lang, oem=oem).extract, on_error=on_error)
+        monitor.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            monitor.stop()
+        return {'recording': path, 'bbox': list(bbox), 'recorded': recorder.records_written,
+                'duplicates': recorder.duplicates_skipped, 'errors': errors[0]}
+
+
+def write_record(record):
+    """Print a result record as one JSON line"""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def write_metrics(path):
+    """Write the timing snapshot as JSON to path, or to stderr for '-'"""
+    output = get_metrics().to_json(indent=2) + '\n'
+    if path == '-':
+        sys.stderr.write(output)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(output)
+
+
+def main(argv=None):
+    """Entry point for the headless CLI; returns the process exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.paths and not args.bbox:
+        parser.error("give at least one image path or --bbox")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.record and (len(args.bbox) != 1 or args.paths):
+        parser.error("--record needs exactly one --bbox and no image paths")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+
+    if args.backend:
+        set_default_backend(args.backend)
+    cache = None if args.no_cache else OCRCache()
+    oem = OEM_MODES[args.oem]
+    postprocessor = None
+    if args.layout or args.fix or args.dictionary:
+        try:
+            postprocessor = PostProcessor(args.fix or (), args.dictionary, reflow=args.layout)
+        except OSError as e:
+            parser.error(f"cannot read --dictionary: {e}")
+    if args.trace:
+        get_metrics().add_hook(json_log_hook(sys.stderr))
+
+    if args.record:
+        summary = record_region(args.bbox[0], args.record, args.interval, args.duration,
+                                args.lang, oem)
+        sys.stderr.write(json.dumps(summary) + '\n')
+        if args.metrics:
+            write_metrics(args.metrics)
+        return 1 if summary['errors'] and not summary['recorded'] else 0
+
+    failures = 0
+    if args.bbox:
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='ocr-cli') as pool:
+            for record in pool.map(lambda bbox: capture_record(bbox, args.config, cache, args.profile,
+                                                               args.lang, oem, postprocessor),
+                                   args.bbox):
+                failures += record['error'] is not None
+                write_record(record)
+
+    if args.paths:
+        checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+        try:
+            for record in run_batch(iter_image_paths(args.paths), args.config,
+                                    workers=args.workers, processes=args.processes,
+                                    checkpoint=checkpoint, cache=cache,
+                                    profile=args.profile, lang=args.lang, oem=oem,
+                                    postprocessor=postprocessor):
+                failures += record['error'] is not None
+                write_record(record)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+    if args.metrics:
+        write_metrics(args.metrics)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,576 @@
+"""
+OCR engine backends for Live Screen Text Extractor
+Every extraction used to start a fresh tesseract process through
+pytesseract. The in-process backends here keep a bounded, process-wide
+pool of initialised Tesseract APIs that threads check out per call, so
+the traineddata is loaded once, not per call.
+
+Backends, in order of preference:
+    tesserocr    - tesserocr bindings, if the package is installed
+    capi         - libtesseract C API loaded through ctypes
+    pytesseract  - the original subprocess path, always available
+"""
+
+import ctypes
+import ctypes.util
+import locale
+import shlex
+import sys
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+DEFAULT_LANGUAGE = 'eng'
+DEFAULT_PSM = 6
+
+# Tesseract OCR engine modes (--oem)
+OEM_MODES = {'legacy': 0, 'lstm': 1, 'combined': 2, 'default': 3}
+DEFAULT_OEM = OEM_MODES['default']
+
+# Language value that asks for script detection (OSD) before recognition
+AUTO_LANGUAGE = 'auto'
+
+# Tesseract OSD script names and the traineddata used for them. Latin
+# script does not say which language it is, so it maps to the caller's
+# choice (see language_for_script)
+SCRIPT_LANGUAGES = {
+    'Han': 'chi_sim',
+    'HanS': 'chi_sim',
+    'HanT': 'chi_tra',
+    'Japanese': 'jpn',
+    'Katakana': 'jpn',
+    'Hiragana': 'jpn',
+    'Hangul': 'kor',
+    'Korean': 'kor',
+    'Cyrillic': 'rus',
+    'Greek': 'ell',
+    'Arabic': 'ara',
+    'Hebrew': 'heb',
+    'Devanagari': 'hin',
+    'Thai': 'tha',
+}
+
+# Engines loaded at once across all threads. Idle engines of the least
+# recently used language/OEM combination are closed to make room for
+# another one; when every engine is busy, callers wait for one
+MAX_POOLED_ENGINES = 8
+
+
+class OCREngineError(Exception):
+    """Raised when an OCR backend cannot be loaded or initialised"""
+
+
+def parse_tesseract_config(config):
+    """Pull the options the in-process backends understand out of a config
+
+    Args:
+        config: Tesseract command line options, e.g. '--psm 6'
+
+    Returns:
+        Dict with 'psm' (int or None) and 'variables' (dict of -c settings)
+    """
+    options = {'psm': None, 'variables': {}}
+    tokens = shlex.split(config or '')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '--psm' and i + 1 < len(tokens):
+            options['psm'] = int(tokens[i + 1])
+            i += 1
+        elif token == '-c' and i + 1 < len(tokens):
+            name, _, value = tokens[i + 1].partition('=')
+            options['variables'][name] = value
+            i += 1
+        i += 1
+    return options
+
+
+class OCREngine:
+    """Common interface for OCR backends"""
+
+    name = None
+
+    def __init__(self, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+        self.lang = lang
+        self.oem = oem
+
+    def image_to_string(self, image, config=''):
+        """Recognise text in a PIL image"""
+        raise NotImplementedError
+
+    def recognize_array(self, array, config=''):
+        """Recognise text in an 8-bit grayscale or RGB NumPy array
+
+        Backends that accept raw pixel buffers override this to skip the
+        PIL conversion and image encoding.
+        """
+        return self.image_to_string(Image.fromarray(array), config)
+
+    def image_to_data(self, image, config=''):
+        """Recognise a PIL image and return Tesseract's TSV output
+
+        One row per page, block, paragraph, line and word with its box and
+        confidence; see ocr_result.parse_tsv().
+        """
+        raise NotImplementedError
+
+    def recognize_data(self, array, config=''):
+        """TSV output for an 8-bit grayscale or RGB NumPy array"""
+        return self.image_to_data(Image.fromarray(array), config)
+
+    def detect_script(self, array):
+        """Detect the dominant script with Tesseract OSD
+
+        Needs an engine created for the 'osd' language and a reasonable
+        amount of text in the image.
+
+        Returns:
+            (script name, confidence), e.g. ('Latin', 3.2)
+
+        Raises:
+            OCREngineError: If OSD is unavailable or finds no script
+        """
+        raise OCREngineError(f"{self.name} does not support script detection")
+
+    @property
+    def model(self):
+        """Language and engine mode, as used in cache keys"""
+        return self.lang if self.oem == DEFAULT_OEM else f"{self.lang}/oem{self.oem}"
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class PytesseractEngine(OCREngine):
+    """Fallback backend that runs the tesseract executable for every call"""
+
+    name = 'pytesseract'
+
+    def _config(self, config):
+        if self.oem == DEFAULT_OEM:
+            return config
+        return f"--oem {self.oem} {config}".strip()
+
+    def image_to_string(self, image, config=''):
+        return pytesseract.image_to_string(image, lang=self.lang, config=self._config(config))
+
+    def image_to_data(self, image, config=''):
+        return pytesseract.image_to_data(image, lang=self.lang, config=self._config(config))
+
+    def detect_script(self, array):
+        try:
+            osd = pytesseract.image_to_osd(Image.fromarray(array),
+                                           output_type=pytesseract.Output.DICT)
+        except pytesseract.TesseractError as e:
+            raise OCREngineError(f"Script detection failed: {e}")
+        return osd['script'], float(osd['script_conf'])
+
+
+class TesserocrEngine(OCREngine):
+    """In-process backend using the tesserocr bindings"""
+
+    name = 'tesserocr'
+
+    def __init__(self, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+        super().__init__(lang, oem)
+        try:
+            import tesserocr
+        except ImportError as e:
+            raise OCREngineError(f"tesserocr is not installed: {e}")
+
+        self._tesserocr = tesserocr
+        try:
+            self._api = tesserocr.PyTessBaseAPI(lang=lang, psm=DEFAULT_PSM, oem=oem)
+        except RuntimeError as e:
+            raise OCREngineError(f"Failed to initialise tesserocr: {e}")
+
+    def _configure(self, config):
+        options = parse_tesseract_config(config)
+        self._api.SetPageSegMode(options['psm'] if options['psm'] is not None else DEFAULT_PSM)
+        for name, value in options['variables'].items():
+            self._api.SetVariable(name, value)
+
+    def image_to_string(self, image, config=''):
+        self._configure(config)
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def recognize_array(self, array, config=''):
+        self._configure(config)
+        self._set_array(array)
+        return self._api.GetUTF8Text()
+
+    def _set_array(self, array):
+        # SetImageBytes takes raw pixels, avoiding SetImage's image encoding
+        height, width = array.shape[:2]
+        bytes_per_pixel = 1 if array.ndim == 2 else array.shape[2]
+        self._api.SetImageBytes(array.tobytes(), width, height, bytes_per_pixel,
+                                width * bytes_per_pixel)
+
+    def image_to_data(self, image, config=''):
+        self._configure(config)
+        self._api.SetImage(image)
+        return self._api.GetTSVText(0)
+
+    def recognize_data(self, array, config=''):
+        self._configure(config)
+        self._set_array(array)
+        return self._api.GetTSVText(0)
+
+    def detect_script(self, array):
+        self._api.SetPageSegMode(self._tesserocr.PSM.OSD_ONLY)
+        self._set_array(array)
+        osd = self._api.DetectOrientationScript()
+        if not osd or not osd.get('script_name'):
+            raise OCREngineError("Script detection found no script")
+        return osd['script_name'], float(osd['script_conf'])
+
+    def close(self):
+        self._api.End()
+
+
+def _load_libtesseract():
+    """Locate and load the libtesseract shared library"""
+    candidates = []
+    found = ctypes.util.find_library('tesseract')
+    if found:
+        candidates.append(found)
+    if sys.platform.startswith('win'):
+        candidates += ['libtesseract-5.dll', 'libtesseract-4.dll', 'tesseract53.dll']
+    elif sys.platform == 'darwin':
+        candidates += ['libtesseract.dylib', '/opt/homebrew/lib/libtesseract.dylib',
+                       '/usr/local/lib/libtesseract.dylib']
+    else:
+        candidates += ['libtesseract.so.5', 'libtesseract.so.4']
+
+    for candidate in candidates:
+        try:
+            lib = ctypes.CDLL(candidate)
+        except OSError:
+            continue
+        _declare_capi(lib)
+        return lib
+    raise OCREngineError("libtesseract shared library not found")
+
+
+def _declare_capi(lib):
+    """Declare argument and return types for the C API functions we use"""
+    handle = ctypes.c_void_p
+    lib.TessBaseAPICreate.restype = handle
+    lib.TessBaseAPICreate.argtypes = []
+    lib.TessBaseAPIDelete.restype = None
+    lib.TessBaseAPIDelete.argtypes = [handle]
+    lib.TessBaseAPIInit2.restype = ctypes.c_int
+    lib.TessBaseAPIInit2.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    lib.TessBaseAPIEnd.restype = None
+    lib.TessBaseAPIEnd.argtypes = [handle]
+    lib.TessBaseAPISetPageSegMode.restype = None
+    lib.TessBaseAPISetPageSegMode.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPISetVariable.restype = ctypes.c_int
+    lib.TessBaseAPISetVariable.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p]
+    lib.TessBaseAPISetImage.restype = None
+    lib.TessBaseAPISetImage.argtypes = [handle, ctypes.c_void_p, ctypes.c_int,
+                                        ctypes.c_int, ctypes.c_int, ctypes.c_int]
+    lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetUTF8Text.argtypes = [handle]
+    lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetTsvText.argtypes = [handle, ctypes.c_int]
+    lib.TessDeleteText.restype = None
+    lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+    lib.TessBaseAPIDetectOrientationScript.restype = ctypes.c_int
+    lib.TessBaseAPIDetectOrientationScript.argtypes = [
+        handle, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(ctypes.c_float)]
+
+
+_libtesseract = None
+_libtesseract_lock = threading.Lock()
+
+
+def get_libtesseract():
+    """Return the shared libtesseract handle, loading it on first use"""
+    global _libtesseract
+    with _libtesseract_lock:
+        if _libtesseract is None:
+            _libtesseract = _load_libtesseract()
+        return _libtesseract
+
+
+class CAPIEngine(OCREngine):
+    """In-process backend calling the libtesseract C API through ctypes"""
+
+    name = 'capi'
+
+    def __init__(self, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+        super().__init__(lang, oem)
+        self._lib = get_libtesseract()
+
+        # Tesseract refuses to initialise unless numbers parse in the C locale
+        locale.setlocale(locale.LC_NUMERIC, 'C')
+
+        self._handle = self._lib.TessBaseAPICreate()
+        if self._lib.TessBaseAPIInit2(self._handle, None, lang.encode('utf-8'), oem) != 0:
+            self._lib.TessBaseAPIDelete(self._handle)
+            self._handle = None
+            raise OCREngineError(f"Failed to load Tesseract language data for '{lang}'")
+
+    def _configure(self, config):
+        options = parse_tesseract_config(config)
+        psm = options['psm'] if options['psm'] is not None else DEFAULT_PSM
+        self._lib.TessBaseAPISetPageSegMode(self._handle, psm)
+        for name, value in options['variables'].items():
+            self._lib.TessBaseAPISetVariable(self._handle, name.encode('utf-8'),
+                                             value.encode('utf-8'))
+
+    def recognize_bytes(self, data, width, height, bytes_per_pixel, bytes_per_line, config='',
+                        tsv=False):
+        """Recognise text in a raw 8-bit image buffer without encoding it
+
+        Args:
+            data: bytes object or integer address of the first pixel
+            tsv: Return TSV output with boxes and confidences instead of
+                plain text
+        """
+        self._configure(config)
+        # Tesseract copies the pixels during SetImage, so the buffer only
+        # needs to stay alive for the duration of this call
+        self._lib.TessBaseAPISetImage(self._handle, data, width, height,
+                                      bytes_per_pixel, bytes_per_line)
+        if tsv:
+            text_ptr = self._lib.TessBaseAPIGetTsvText(self._handle, 0)
+        else:
+            text_ptr = self._lib.TessBaseAPIGetUTF8Text(self._handle)
+        if not text_ptr:
+            return ''
+        try:
+            return ctypes.string_at(text_ptr).decode('utf-8', errors='replace')
+        finally:
+            self._lib.TessDeleteText(text_ptr)
+
+    def recognize_array(self, array, config='', tsv=False):
+        # Row-strided views are passed by address: no copy at all
+        if array.dtype != np.uint8 or array.strides[0] <= 0 or not array[0].flags.c_contiguous:
+            array = np.ascontiguousarray(array, dtype=np.uint8)
+        height, width = array.shape[:2]
+        bytes_per_pixel = 1 if array.ndim == 2 else array.shape[2]
+        return self.recognize_bytes(array.ctypes.data, width, height, bytes_per_pixel,
+                                    array.strides[0], config, tsv)
+
+    def image_to_string(self, image, config='', tsv=False):
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        bytes_per_pixel = 1 if image.mode == 'L' else 3
+        return self.recognize_bytes(image.tobytes(), image.width, image.height,
+                                    bytes_per_pixel, image.width * bytes_per_pixel, config, tsv)
+
+    def image_to_data(self, image, config=''):
+        return self.image_to_string(image, config, tsv=True)
+
+    def recognize_data(self, array, config=''):
+        return self.recognize_array(array, config, tsv=True)
+
+    def detect_script(self, array):
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+        height, width = array.shape[:2]
+        bytes_per_pixel = 1 if array.ndim == 2 else array.shape[2]
+        self._lib.TessBaseAPISetPageSegMode(self._handle, 0)  # PSM_OSD_ONLY
+        self._lib.TessBaseAPISetImage(self._handle, array.ctypes.data, width, height,
+                                      bytes_per_pixel, array.strides[0])
+        degrees = ctypes.c_int()
+        orientation_conf = ctypes.c_float()
+        script = ctypes.c_char_p()
+        script_conf = ctypes.c_float()
+        if not self._lib.TessBaseAPIDetectOrientationScript(
+                self._handle, ctypes.byref(degrees), ctypes.byref(orientation_conf),
+                ctypes.byref(script), ctypes.byref(script_conf)) or not script.value:
+            raise OCREngineError("Script detection found no script")
+        return script.value.decode('utf-8'), script_conf.value
+
+    def close(self):
+        if self._handle:
+            self._lib.TessBaseAPIEnd(self._handle)
+            self._lib.TessBaseAPIDelete(self._handle)
+            self._handle = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+ENGINE_BACKENDS = {
+    TesserocrEngine.name: TesserocrEngine,
+    CAPIEngine.name: CAPIEngine,
+    PytesseractEngine.name: PytesseractEngine,
+}
+
+# Backends tried, in order, when no backend is requested explicitly
+BACKEND_PREFERENCE = ('tesserocr', 'capi', 'pytesseract')
+
+
+def create_engine(backend=None, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Create an OCR engine
+
+    Args:
+        backend: Backend name from ENGINE_BACKENDS, or None to pick the
+            first one that loads from BACKEND_PREFERENCE
+        lang: Tesseract language code, e.g. 'eng', 'deu' or 'eng+deu'
+        oem: Tesseract OCR engine mode, see OEM_MODES
+
+    Returns:
+        An initialised OCREngine
+
+    Raises:
+        OCREngineError: If the requested backend cannot be initialised
+    """
+    if backend is not None:
+        if backend not in ENGINE_BACKENDS:
+            raise OCREngineError(f"Unknown OCR backend '{backend}'")
+        return ENGINE_BACKENDS[backend](lang, oem)
+
+    for name in BACKEND_PREFERENCE:
+        try:
+            return ENGINE_BACKENDS[name](lang, oem)
+        except OCREngineError:
+            continue
+    raise OCREngineError("No OCR backend could be initialised")
+
+
+def available_backends(lang=DEFAULT_LANGUAGE):
+    """List the backends that can be initialised on this machine"""
+    names = []
+    for name in BACKEND_PREFERENCE:
+        try:
+            create_engine(name, lang).close()
+        except OCREngineError:
+            continue
+        names.append(name)
+    return names
+
+
+class EnginePool:
+    """Process-wide pool of OCR engines, checked out by one thread at a time
+
+    A Tesseract API instance must not be used by two threads at once, so
+    each call takes an engine out of the pool and returns it afterwards.
+    Idle engines are kept per (backend, lang, oem) key so traineddata is
+    loaded once, and at most max_engines exist in total, however many
+    threads run OCR.
+    """
+
+    def __init__(self, max_engines=MAX_POOLED_ENGINES):
+        self.max_engines = max(1, max_engines)
+        self._condition = threading.Condition()
+        # key -> idle engines, least recently used key first
+        self._idle = OrderedDict()
+        # key -> engines loaded, idle or checked out
+        self._loaded = Counter()
+
+    def acquire(self, backend, lang, oem):
+        """Take an engine for backend, lang and oem, creating or waiting as needed"""
+        key = (backend, lang, oem)
+        with self._condition:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    engine = idle.pop()
+                    if not idle:
+                        del self._idle[key]
+                    return engine
+                evicted = None
+                if sum(self._loaded.values()) < self.max_engines:
+                    break
+                if self._idle:
+                    # Make room by dropping the least recently used idle
+                    # engine; none of them is for this key
+                    other, engines = next(iter(self._idle.items()))
+                    evicted = engines.pop(0)
+                    if not engines:
+                        del self._idle[other]
+                    self._loaded[other] -= 1
+                    break
+                self._condition.wait()
+            self._loaded[key] += 1
+
+        # Loading traineddata is slow; do it outside the lock
+        try:
+            if evicted is not None:
+                evicted.close()
+            return create_engine(backend, lang, oem)
+        except BaseException:
+            with self._condition:
+                self._loaded[key] -= 1
+                self._condition.notify_all()
+            raise
+
+    def release(self, backend, lang, oem, engine):
+        """Return an engine taken with acquire()"""
+        key = (backend, lang, oem)
+        with self._condition:
+            self._idle.setdefault(key, []).append(engine)
+            self._idle.move_to_end(key)
+            self._condition.notify_all()
+
+
+_default_backend = None
+_engine_pool = EnginePool()
+
+
+def set_default_backend(backend):
+    """Choose the backend used by checkout_engine(); None restores auto-selection"""
+    global _default_backend
+    if backend is not None and backend not in ENGINE_BACKENDS:
+        raise OCREngineError(f"Unknown OCR backend '{backend}'")
+    _default_backend = backend
+
+
+def get_default_backend():
+    """Return the backend name set with set_default_backend(), or None"""
+    return _default_backend
+
+
+@contextmanager
+def checkout_engine(lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Borrow a pooled OCR engine for lang and oem for the duration of a with block
+
+    Engines are shared by all threads but used by one at a time, and up
+    to MAX_POOLED_ENGINES stay loaded, so switching back and forth
+    between languages does not reload traineddata. Do not check out a
+    second engine inside the block: with every engine busy that waits
+    forever.
+    """
+    backend = _default_backend
+    engine = _engine_pool.acquire(backend, lang, oem)
+    try:
+        yield engine
+    finally:
+        _engine_pool.release(backend, lang, oem, engine)
+
+
+def language_for_script(script, latin=DEFAULT_LANGUAGE):
+    """Tesseract language to recognise text in an OSD script
+
+    Args:
+        script: Script name reported by detect_script(), e.g. 'Han'
+        latin: Language used for Latin and unknown scripts
+    """
+    return SCRIPT_LANGUAGES.get(script, latin)
+
+
+def detect_language(array, latin=DEFAULT_LANGUAGE):
+    """Pick a Tesseract language for a binarised image with OSD
+
+    Falls back to latin when OSD is not installed or the image holds too
+    little text to tell.
+    """
+    try:
+        with checkout_engine('osd') as engine:
+            script, _ = engine.detect_script(array)
+    except OCREngineError:
+        return latin
+    return language_for_script(script, latin)
@@ -0,0 +1,148 @@
+"""
+Background OCR execution for Live Screen Text Extractor
+Runs OCR jobs on a worker pool so the Tk main loop never blocks on
+preprocessing or Tesseract. Finished jobs are handed back on whichever
+thread calls poll(), which the GUI schedules with root.after.
+"""
+
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def default_worker_count():
+    """Number of OCR workers to use when none is configured"""
+    # Tesseract work happens outside the GIL (subprocess or C API), so one
+    # worker per core keeps every core busy without oversubscribing.
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Process-wide thread pool for the parallel parts of an extraction
+
+    Text detection and multi-region extraction fan their regions out to
+    these long-lived threads instead of starting new ones per call. Jobs
+    submitted here must not wait on other jobs in the same pool.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ThreadPoolExecutor(max_workers=default_worker_count(),
+                                              thread_name_prefix='ocr-shared')
+        return _shared_pool
+
+
+class OCRJob:
+    """Handle for a job submitted to an OCRExecutor"""
+
+    __slots__ = ('job_id', 'future', 'on_done', 'on_error', 'cancelled')
+
+    def __init__(self, job_id, on_done=None, on_error=None):
+        self.job_id = job_id
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def done(self):
+        """Return True once the job has finished, failed or been cancelled"""
+        return self.cancelled or (self.future is not None and self.future.done())
+
+
+class OCRExecutor:
+    """Thread pool for OCR jobs with cancellation and main-thread delivery
+
+    Jobs run on worker threads. Their callbacks are never invoked from a
+    worker; instead completed jobs are queued and delivered by poll(), so
+    GUI code can touch Tk widgets safely from on_done/on_error.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or default_worker_count()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                        thread_name_prefix='ocr-worker')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._completed = queue.Queue()
+        self._ids = itertools.count(1)
+        self._closed = False
+
+    @property
+    def in_flight(self):
+        """Number of submitted jobs that have not been delivered or cancelled"""
+        with self._lock:
+            return len(self._jobs)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Queue fn(*args, **kwargs) on the pool and return its OCRJob
+
+        on_done(result) or on_error(exception) is called from poll() once
+        the job finishes, unless the job was cancelled first.
+        """
+        if self._closed:
+            raise RuntimeError("OCR executor has been shut down")
+
+        job = OCRJob(next(self._ids), on_done, on_error)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        job.future = self._pool.submit(fn, *args, **kwargs)
+        job.future.add_done_callback(lambda _future: self._completed.put(job))
+        return job
+
+    def cancel(self, job_id):
+        """Cancel a job; returns False if it is unknown or already delivered
+
+        Jobs still waiting in the queue never start. A job that is already
+        running cannot be interrupted, but its result is discarded.
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        job.cancelled = True
+        job.future.cancel()
+        return True
+
+    def cancel_all(self):
+        """Cancel every outstanding job and return how many were cancelled"""
+        with self._lock:
+            job_ids = list(self._jobs)
+        return sum(1 for job_id in job_ids if self.cancel(job_id))
+
+    def poll(self):
+        """Deliver finished jobs to their callbacks on the calling thread
+
+        Returns the number of callbacks that were invoked.
+        """
+        delivered = 0
+        while True:
+            try:
+                job = self._completed.get_nowait()
+            except queue.Empty:
+                return delivered
+
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            if job.cancelled or job.future.cancelled():
+                continue
+
+            error = job.future.exception()
+            if error is None:
+                if job.on_done:
+                    job.on_done(job.future.result())
+                    delivered += 1
+            elif job.on_error:
+                job.on_error(error)
+                delivered += 1
+
+    def shutdown(self, wait=False):
+        """Cancel outstanding jobs and stop the worker threads"""
+        self._closed = True
+        self.cancel_all()
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,353 @@
+"""
+OCR pipeline for Live Screen Text Extractor
+Preprocessing and text recognition shared by the GUI and background workers.
+Nothing in here touches Tk, so it is safe to call from any thread.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import Image
+
+from capture_backends import get_capture_backend
+from metrics import get_metrics
+from ocr_engine import (AUTO_LANGUAGE, DEFAULT_LANGUAGE, DEFAULT_OEM, OCREngineError,
+                        checkout_engine, detect_language)
+from ocr_executor import shared_pool
+from ocr_result import parse_tsv
+from preprocessing import DEFAULT_PROFILE, Preprocessor, get_preprocessor
+
+# --psm 6: Uniform block of text
+DEFAULT_OCR_CONFIG = '--psm 6'
+
+# --psm 7: Treat the image as a single text line
+LINE_OCR_CONFIG = '--psm 7'
+
+# Outcome of one region in a batch extraction; error is None on success
+RegionResult = namedtuple('RegionResult', ['name', 'bbox', 'text', 'error'])
+
+
+def binarize(image, profile='otsu'):
+    """Threshold a screenshot with Otsu's method
+
+    Args:
+        image: PIL Image captured from the screen, or an RGB NumPy array
+            (views into a larger frame are used without copying)
+        profile: Preprocessing profile, see preprocessing.PROFILES
+
+    Returns:
+        New uint8 NumPy array containing only 0 and 255; hot paths use
+        get_preprocessor().binarize() to reuse a buffer instead
+    """
+    return Preprocessor().binarize(image, profile)
+
+
+def preprocess_image(image):
+    """Convert a PIL screenshot into a binarised image for OCR
+
+    Args:
+        image: PIL Image captured from the screen
+
+    Returns:
+        Grayscale PIL Image thresholded with Otsu's method
+    """
+    return Image.fromarray(binarize(image))
+
+
+def extract_text_from_image(image, config=DEFAULT_OCR_CONFIG, engine=None, cache=None,
+                            profile=DEFAULT_PROFILE, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM,
+                            postprocessor=None):
+    """Preprocess an image and run Tesseract on it
+
+    Args:
+        image: PIL Image to extract text from
+        config: Tesseract configuration string
+        engine: OCREngine to use; defaults to one checked out of the
+            shared engine pool for lang and oem
+        cache: Optional OCRCache consulted before running Tesseract
+        profile: Preprocessing profile; 'auto' picks one per image
+        lang: Tesseract language, e.g. 'deu' or 'eng+deu'; 'auto' detects
+            the script first
+        oem: Tesseract OCR engine mode, see ocr_engine.OEM_MODES
+        postprocessor: Optional callable turning an OCRResult into text,
+            e.g. postprocessing.PostProcessor(); the word boxes come from
+            the same single Tesseract pass
+
+    Returns:
+        Extracted text with surrounding whitespace stripped
+    """
+    if postprocessor is not None:
+        return postprocessor(extract_data_from_image(image, config, engine, cache, profile,
+                                                     lang, oem))
+    # Thread-local buffer; only used until this function returns
+    binary = get_preprocessor().binarize(image, profile)
+    with _engine_for(binary, engine, lang, oem) as engine:
+        return _recognize(binary, config, engine, cache)
+
+
+def extract_data_from_image(image, config=DEFAULT_OCR_CONFIG, engine=None, cache=None,
+                            profile=DEFAULT_PROFILE, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Preprocess an image and recognise it with word boxes and confidences
+
+    Costs the same single Tesseract pass as extract_text_from_image();
+    use OCRResult.text for the plain text.
+
+    Args:
+        image: PIL Image or RGB NumPy array
+        config: Tesseract configuration string
+        engine: OCREngine to use; defaults to one checked out of the
+            shared engine pool for lang and oem
+        cache: Optional OCRCache consulted before running Tesseract
+        profile: Preprocessing profile; 'auto' picks one per image
+        lang: Tesseract language; 'auto' detects the script first
+        oem: Tesseract OCR engine mode
+
+    Returns:
+        OCRResult with boxes in the coordinates of image
+    """
+    binary = get_preprocessor().binarize(image, profile)
+    with _engine_for(binary, engine, lang, oem) as engine:
+        result = parse_tsv(_recognize(binary, config, engine, cache, structured=True))
+
+    # The 'upscale' profile recognises a larger buffer than the input
+    height = image.shape[0] if hasattr(image, 'shape') else image.height
+    if binary.shape[0] != height:
+        result = result.scaled(height / binary.shape[0])
+    return result
+
+
+def resolve_language(image, lang=AUTO_LANGUAGE, profile=DEFAULT_PROFILE):
+    """Turn lang 'auto' into a concrete language by running OSD on image
+
+    Lets callers that OCR many pieces of one image (text detection, watch
+    mode) detect the script once, on the whole image, and reuse it.
+    Other languages are returned unchanged.
+    """
+    if lang != AUTO_LANGUAGE:
+        return lang
+    return _detect_language(get_preprocessor().binarize(image, profile))
+
+
+def _detect_language(binary):
+    with get_metrics().timer('osd'):
+        return detect_language(binary)
+
+
+@contextmanager
+def _engine_for(binary, engine, lang, oem):
+    """Use engine, or check out a pooled one for lang and oem, detecting 'auto' on binary"""
+    if engine is not None:
+        yield engine
+        return
+    if lang == AUTO_LANGUAGE:
+        lang = _detect_language(binary)
+    with checkout_engine(lang, oem) as engine:
+        yield engine
+
+
+def _recognize(binary, config, engine, cache, structured=False):
+    """Run engine on a binarised buffer, going through cache if given
+
+    Returns:
+        Stripped text, or TSV output when structured is true
+    """
+    metrics = get_metrics()
+    key = None
+    if cache is not None:
+        # Plain text and TSV for the same pixels are cached separately
+        key = cache.make_key(binary, config + ('|tsv' if structured else ''), engine.model)
+        output = cache.get(key)
+        if output is not None:
+            metrics.increment('cache_hits')
+            return output
+        metrics.increment('cache_misses')
+
+    with metrics.timer('ocr'):
+        if structured:
+            output = engine.recognize_data(binary, config=config)
+        else:
+            output = engine.recognize_array(binary, config=config).strip()
+    if cache is not None:
+        cache.put(key, output)
+    return output
+
+
+def warm_up(lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Get the process ready for its first extraction
+
+    Importing this module loads NumPy, OpenCV and PIL; this also loads a
+    pooled OCR engine for lang and oem and runs it once on a blank
+    image, which is the cheapest way to confirm Tesseract is installed
+    and working. For 'auto' the default language is loaded.
+
+    Raises:
+        OCREngineError: If no OCR backend can recognise text
+    """
+    if lang == AUTO_LANGUAGE:
+        lang = DEFAULT_LANGUAGE
+    try:
+        with checkout_engine(lang, oem) as engine:
+            engine.recognize_array(np.full((32, 32), 255, dtype=np.uint8),
+                                   config=DEFAULT_OCR_CONFIG)
+    except OCREngineError:
+        raise
+    except Exception as e:
+        raise OCREngineError(f"Tesseract is not working: {e}")
+
+
+def find_line_bands(binary, min_gap=2, min_height=4, padding=3):
+    """Locate horizontal bands of text in a binarised image
+
+    Rows containing any ink are grouped into runs; runs separated by fewer
+    than min_gap blank rows are merged so descenders and accents stay
+    with their line.
+
+    Args:
+        binary: uint8 array from binarize()
+        min_gap: Blank rows needed to separate two lines
+        min_height: Bands shorter than this are treated as noise
+        padding: Blank rows kept above and below each band
+
+    Returns:
+        List of (top, bottom) row ranges in reading order
+    """
+    # Ink is whichever colour is in the minority, so dark themes work too
+    ink = binary < 128 if binary.mean() >= 128 else binary >= 128
+    rows = ink.any(axis=1).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], rows, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    bands = []
+    for start, end in zip(starts, ends):
+        if bands and start - bands[-1][1] < min_gap:
+            bands[-1][1] = end
+        else:
+            bands.append([start, end])
+
+    height = binary.shape[0]
+    return [(max(0, int(top) - padding), min(height, int(bottom) + padding))
+            for top, bottom in bands if bottom - top >= min_height]
+
+
+def union_bbox(bboxes):
+    """Smallest (x1, y1, x2, y2) box containing every box in bboxes"""
+    x1s, y1s, x2s, y2s = zip(*bboxes)
+    return min(x1s), min(y1s), max(x2s), max(y2s)
+
+
+def capture_regions(regions, grab=None):
+    """Capture several screen regions with a single screen grab
+
+    Only the bounding box of all regions is grabbed; each region is then
+    returned as a NumPy view into that one frame, so no pixels are copied
+    per region.
+
+    Args:
+        regions: Mapping of region name to (x1, y1, x2, y2) screen box
+        grab: Callable taking a bbox and returning an RGB array or PIL
+            Image; defaults to this thread's capture backend
+
+    Returns:
+        Dict mapping each region name to an RGB NumPy view
+    """
+    if not regions:
+        return {}
+
+    left, top, right, bottom = union_bbox(regions.values())
+    frame = capture_screen((left, top, right, bottom), grab)
+
+    return {name: frame[y1 - top:y2 - top, x1 - left:x2 - left]
+            for name, (x1, y1, x2, y2) in regions.items()}
+
+
+def extract_regions(regions, config=DEFAULT_OCR_CONFIG, cache=None, max_workers=None, grab=None,
+                    lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Capture several named regions at once and OCR them in parallel
+
+    Args:
+        regions: Mapping of region name to (x1, y1, x2, y2) screen box
+        config: Tesseract configuration string
+        cache: Optional OCRCache shared by all regions
+        max_workers: Number of OCR threads; by default the regions run on
+            ocr_executor.shared_pool()
+        grab: Screen grab callable, see capture_regions()
+        lang: Tesseract language; 'auto' detects each region's script
+        oem: Tesseract OCR engine mode
+
+    Returns:
+        List of RegionResult in the order the regions were given
+    """
+    crops = capture_regions(regions, grab)
+    if not crops:
+        return []
+
+    def recognise(name):
+        try:
+            return RegionResult(name, regions[name],
+                                extract_text_from_image(crops[name], config, cache=cache,
+                                                        lang=lang, oem=oem), None)
+        except Exception as e:
+            return RegionResult(name, regions[name], None, e)
+
+    if max_workers:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr-region') as pool:
+            return list(pool.map(recognise, crops))
+    # Long-lived threads instead of a new pool per call
+    return list(shared_pool().map(recognise, crops))
+
+
+def capture_screen(bbox=None, grab=None):
+    """Capture a screen region as an RGB NumPy array
+
+    Args:
+        bbox: (x1, y1, x2, y2) screen box, or None for the whole screen
+        grab: Callable taking a bbox and returning an RGB array or PIL
+            Image; defaults to this thread's capture backend
+    """
+    grab = grab or get_capture_backend().grab
+    with get_metrics().timer('capture'):
+        return np.asarray(grab(tuple(bbox) if bbox else None))
+
+
+def extract_text_from_screen(bbox=None, config=DEFAULT_OCR_CONFIG, engine=None, cache=None,
+                             profile=DEFAULT_PROFILE, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM,
+                             postprocessor=None):
+    """Capture a screen region and return its text
+
+    Args:
+        bbox: (x1, y1, x2, y2) screen box, or None for the whole screen
+        config: Tesseract configuration string
+        engine: OCREngine to use; defaults to one checked out of the
+            shared engine pool
+        cache: Optional OCRCache consulted before running Tesseract
+        profile: Preprocessing profile; 'auto' picks one per image
+        lang: Tesseract language; 'auto' detects the script first
+        oem: Tesseract OCR engine mode
+        postprocessor: Optional OCRResult -> text callable
+    """
+    return extract_text_from_image(capture_screen(bbox), config, engine, cache, profile, lang, oem,
+                                   postprocessor)
+
+
+def extract_text_from_file(path, config=DEFAULT_OCR_CONFIG, engine=None, cache=None,
+                           profile=DEFAULT_PROFILE, lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM,
+                           postprocessor=None):
+    """Load an image file and return its text
+
+    Args:
+        path: Path to any image format Pillow can read
+        config: Tesseract configuration string
+        engine: OCREngine to use; defaults to one checked out of the
+            shared engine pool
+        cache: Optional OCRCache consulted before running Tesseract
+        profile: Preprocessing profile; 'auto' picks one per image
+        lang: Tesseract language; 'auto' detects the script first
+        oem: Tesseract OCR engine mode
+        postprocessor: Optional OCRResult -> text callable
+    """
+    with Image.open(path) as image:
+        rgb = image.convert('RGB')
+    return extract_text_from_image(rgb, config, engine, cache, profile, lang, oem, postprocessor)
@@ -0,0 +1,193 @@
+"""
+Structured OCR results for Live Screen Text Extractor
+Tesseract's TSV output (the same data pytesseract.image_to_data returns)
+holds the text together with word, line and block boxes and confidences.
+OCRResult keeps it as a handful of parallel NumPy arrays instead of a
+dict of string lists, so one recognition pass serves both the plain text
+and geometric queries such as words in a rectangle or low-confidence
+words.
+"""
+
+import numpy as np
+
+# Words below this confidence (0-100) count as uncertain
+LOW_CONFIDENCE = 60
+
+# TSV levels
+_BLOCK, _PARAGRAPH, _LINE, _WORD = 2, 3, 4, 5
+
+
+class OCRResult:
+    """Recognised text with word, line and block geometry
+
+    Word i spans text[starts[i]:ends[i]]. Boxes are int32 (x1, y1, x2, y2)
+    rows in image pixels; confidences are float32 in 0-100.
+
+    Attributes:
+        text: Words joined by spaces, lines by newlines, blocks by a blank line
+        boxes: (N, 4) word boxes
+        confidences: (N,) word confidences
+        starts, ends: (N,) character offsets of each word in text
+        line_ids: (N,) index into line_boxes of each word's line
+        block_ids: (N,) index into block_boxes of each word's block
+        line_boxes: (L, 4) line boxes
+        block_boxes: (B, 4) block boxes
+    """
+
+    __slots__ = ('text', 'boxes', 'confidences', 'starts', 'ends', 'line_ids', 'block_ids',
+                 'line_boxes', 'block_boxes')
+
+    def __init__(self, text, boxes, confidences, starts, ends, line_ids, block_ids,
+                 line_boxes, block_boxes):
+        self.text = text
+        self.boxes = boxes
+        self.confidences = confidences
+        self.starts = starts
+        self.ends = ends
+        self.line_ids = line_ids
+        self.block_ids = block_ids
+        self.line_boxes = line_boxes
+        self.block_boxes = block_boxes
+
+    @classmethod
+    def empty(cls):
+        """Result with no words"""
+        return parse_tsv('')
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def word(self, index):
+        """Text of word index"""
+        return self.text[self.starts[index]:self.ends[index]]
+
+    def words(self, indices=None):
+        """Text of the given words (default: all) as a list"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.word(i) for i in indices]
+
+    def words_in(self, rect, whole=False):
+        """Indices of words inside rect
+
+        Args:
+            rect: (x1, y1, x2, y2) in image pixels
+            whole: Require the whole box inside; by default the centre
+                being inside is enough
+
+        Returns:
+            int array of word indices in reading order
+        """
+        x1, y1, x2, y2 = rect
+        boxes = self.boxes
+        if whole:
+            mask = ((boxes[:, 0] >= x1) & (boxes[:, 1] >= y1)
+                    & (boxes[:, 2] <= x2) & (boxes[:, 3] <= y2))
+        else:
+            cx = (boxes[:, 0] + boxes[:, 2]) // 2
+            cy = (boxes[:, 1] + boxes[:, 3]) // 2
+            mask = (cx >= x1) & (cx < x2) & (cy >= y1) & (cy < y2)
+        return np.flatnonzero(mask)
+
+    def low_confidence(self, threshold=LOW_CONFIDENCE):
+        """Indices of words recognised with confidence below threshold"""
+        return np.flatnonzero(self.confidences < threshold)
+
+    def mean_confidence(self):
+        """Average word confidence, or 0.0 when there are no words"""
+        return float(self.confidences.mean()) if len(self) else 0.0
+
+    def line_text(self, line):
+        """Text of line index, taken from its first to its last word"""
+        indices = np.flatnonzero(self.line_ids == line)
+        if not len(indices):
+            return ''
+        return self.text[self.starts[indices[0]]:self.ends[indices[-1]]]
+
+    def translate(self, dx, dy):
+        """Return a copy with every box shifted by (dx, dy)
+
+        Used to map results for a crop back into the coordinates of the
+        image it was cut from.
+        """
+        offset = np.array([dx, dy, dx, dy], dtype=np.int32)
+        return OCRResult(self.text, self.boxes + offset, self.confidences, self.starts,
+                         self.ends, self.line_ids, self.block_ids,
+                         self.line_boxes + offset, self.block_boxes + offset)
+
+    def scaled(self, factor):
+        """Return a copy with every box multiplied by factor
+
+        Maps results from an upscaled preprocessing buffer back to the
+        original image.
+        """
+        def scale(boxes):
+            return np.rint(boxes * factor).astype(np.int32)
+        return OCRResult(self.text, scale(self.boxes), self.confidences, self.starts,
+                         self.ends, self.line_ids, self.block_ids,
+                         scale(self.line_boxes), scale(self.block_boxes))
+
+    def __repr__(self):
+        return f"OCRResult({len(self)} words, {len(self.line_boxes)} lines, {len(self.block_boxes)} blocks)"
+
+
+def parse_tsv(tsv):
+    """Build an OCRResult from Tesseract TSV output
+
+    Accepts the output of TessBaseAPI::GetTSVText and of
+    pytesseract.image_to_data (which adds a header row).
+    """
+    boxes, confidences, starts, ends, line_ids, block_ids = [], [], [], [], [], []
+    line_boxes, block_boxes = [], []
+    parts = []
+    length = 0
+    line_key = block_key = None
+
+    for row in tsv.splitlines():
+        fields = row.split('\t', 11)
+        if len(fields) < 11 or not fields[0].isdigit():
+            continue  # header or truncated row
+        level = int(fields[0])
+        left, top, width, height = (int(v) for v in fields[6:10])
+        box = (left, top, left + width, top + height)
+
+        if level == _BLOCK:
+            block_boxes.append(box)
+        elif level == _LINE:
+            line_boxes.append(box)
+        elif level == _WORD:
+            word = fields[11].strip() if len(fields) > 11 else ''
+            if not word:
+                continue
+            key = (fields[2], fields[3], fields[4])
+            if parts:
+                if fields[2] != block_key:
+                    separator = '\n\n'
+                elif key != line_key:
+                    separator = '\n'
+                else:
+                    separator = ' '
+                parts.append(separator)
+                length += len(separator)
+            line_key, block_key = key, fields[2]
+
+            boxes.append(box)
+            confidences.append(float(fields[10]))
+            starts.append(length)
+            parts.append(word)
+            length += len(word)
+            ends.append(length)
+            line_ids.append(len(line_boxes) - 1)
+            block_ids.append(len(block_boxes) - 1)
+
+    return OCRResult(
+        ''.join(parts),
+        np.array(boxes, dtype=np.int32).reshape(-1, 4),
+        np.array(confidences, dtype=np.float32),
+        np.array(starts, dtype=np.int32),
+        np.array(ends, dtype=np.int32),
+        np.array(line_ids, dtype=np.int32),
+        np.array(block_ids, dtype=np.int32),
+        np.array(line_boxes, dtype=np.int32).reshape(-1, 4),
+        np.array(block_boxes, dtype=np.int32).reshape(-1, 4),
+    )
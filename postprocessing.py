@@ -0,0 +1,263 @@
+"""
+Text post-processing for Live Screen Text Extractor
+Tesseract's text keeps the line breaks of the screen: paragraphs come
+out hard-wrapped, words hyphenated at line ends stay split, and table
+columns collapse into single spaces. reconstruct_layout() rebuilds
+paragraphs and columns from the word boxes of an OCRResult with a few
+vectorised NumPy passes, and normalize_text() fixes common OCR
+confusions with precompiled regular expressions.
+
+Correction rule sets (RULE_SETS):
+    letters  - 0/1 inside words become o/O/l
+    numbers  - O/o, l/I/| inside numbers become 0/1; stray spaces before a
+               decimal or thousands separator are removed
+    urls     - spaces Tesseract puts into URLs and domains are removed
+    code     - spaces before punctuation and inside brackets are removed
+"""
+
+import re
+
+import numpy as np
+
+from metrics import get_metrics
+
+# Word gaps wider than this many character widths separate table columns
+COLUMN_GAP_CHARS = 2.5
+
+# Vertical gaps above this many line heights start a new paragraph
+PARAGRAPH_GAP_LINES = 0.8
+
+# A first line indented by more than this many characters starts a paragraph
+INDENT_CHARS = 2
+
+# Lines with fewer words (menus, labels, headings) are never joined to the next
+MIN_REFLOW_WORDS = 4
+
+DEFAULT_RULES = ('letters', 'numbers')
+
+# Typographic characters Tesseract emits for plain ASCII ones
+_TRANSLATION = str.maketrans({
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl', '\ufb03': 'ffi', '\ufb04': 'ffl',
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201c': '"', '\u201d': '"', '\u201e': '"',
+    '\u00a0': ' ', '\u2009': ' ', '\u202f': ' ',
+    '\u200b': None, '\ufeff': None,
+})
+
+_WHITESPACE_RULES = (
+    (re.compile(r' {2,}'), ' '),
+    (re.compile(r'[ \t]+$', re.MULTILINE), ''),
+)
+
+RULE_SETS = {
+    'letters': (
+        (re.compile(r'(?<=[a-z])0(?=[a-z])'), 'o'),
+        (re.compile(r'(?<=[A-Z])0(?=[A-Z])'), 'O'),
+        (re.compile(r'(?<=[a-z])1(?=[a-z])'), 'l'),
+    ),
+    'numbers': (
+        (re.compile(r'(?<=\d)[Oo](?![A-Za-z])|\b[Oo](?=[.,]?\d{2})'), '0'),
+        (re.compile(r'(?<=\d)[lI|](?=\d)'), '1'),
+        (re.compile(r'(?<=\d) ([.,])(?=\d)'), r'\1'),
+    ),
+    'urls': (
+        (re.compile(r'\b(https?|ftp) ?: ?/ ?/ ?'), r'\1://'),
+        (re.compile(r'\bwww ?\. ?'), 'www.'),
+        (re.compile(r'(?<=\w) ?\. ?(com|org|net|io|dev|edu|gov|de|uk|fr|jp|cn)\b'), r'.\1'),
+    ),
+    'code': (
+        (re.compile(r' +([,;:)\]}])'), r'\1'),
+        (re.compile(r'([(\[{]) +'), r'\1'),
+        (re.compile(r'(?<=\w) \. (?=\w)'), '.'),
+    ),
+}
+
+# List items are never joined onto the previous line
+_LIST_ITEM = re.compile(r'^(?:[-*•▪◦]|\d{1,3}[.)]|[a-zA-Z][.)])$')
+
+
+def reconstruct_layout(result, reflow=True, column_gap=COLUMN_GAP_CHARS):
+    """Rebuild paragraphs and table columns from an OCRResult's word boxes
+
+    Words on one line are joined by a space, or by a tab where the gap
+    between them is wider than column_gap character widths. With reflow,
+    lines that were soft-wrapped (the next line's first word would not
+    have fitted at the end of this one) are joined into a paragraph, and
+    words hyphenated across the break are rejoined. Lines with columns,
+    list items, indented first lines and vertical gaps keep their breaks;
+    blocks are separated by a blank line. Lines shorter than
+    MIN_REFLOW_WORDS words are never joined, so menus and labels stay
+    one per line.
+
+    Args:
+        result: ocr_result.OCRResult
+        reflow: Join soft-wrapped lines into paragraphs
+        column_gap: Gap, in median character widths, that separates columns
+
+    Returns:
+        Reconstructed text
+    """
+    count = len(result)
+    if not count:
+        return ''
+    words = result.words()
+    boxes = result.boxes.astype(np.float32)
+    left, top, right, bottom = boxes.T
+    lengths = np.maximum(result.ends - result.starts, 1)
+    char_width = max(float(np.median((right - left) / lengths)), 1.0)
+
+    # Separator after each word within its line
+    same_line = result.line_ids[1:] == result.line_ids[:-1]
+    columns = same_line & (left[1:] - right[:-1] > column_gap * char_width)
+
+    # Per-line extents; lines are runs of words sharing a line id
+    line_starts = np.flatnonzero(np.concatenate(([True], ~same_line)))
+    line_ends = np.concatenate((line_starts[1:], [count])) - 1
+    line_left = np.minimum.reduceat(left, line_starts)
+    line_right = np.maximum.reduceat(right, line_starts)
+    line_top = np.minimum.reduceat(top, line_starts)
+    line_bottom = np.maximum.reduceat(bottom, line_starts)
+    line_blocks = result.block_ids[line_starts]
+    line_columns = np.add.reduceat(np.concatenate((columns, [False])).astype(np.int32),
+                                   line_starts) > 0
+    line_height = max(float(np.median(line_bottom - line_top)), 1.0)
+
+    # Right and left margins of each line's block
+    block_index = np.unique(line_blocks, return_inverse=True)[1]
+    block_right = np.full(block_index.max() + 1, -np.inf, dtype=np.float32)
+    block_left = np.full(block_index.max() + 1, np.inf, dtype=np.float32)
+    np.maximum.at(block_right, block_index, line_right)
+    np.minimum.at(block_left, block_index, line_left)
+    margin_right = block_right[block_index]
+    margin_left = block_left[block_index]
+
+    # Decide the break after each line but the last: 0 newline, 1 join,
+    # 2 blank line
+    new_block = line_blocks[1:] != line_blocks[:-1]
+    gap = line_top[1:] - line_bottom[:-1]
+    breaks = np.where(new_block | (gap > PARAGRAPH_GAP_LINES * line_height), 2, 0)
+    if reflow:
+        first_word = right[line_starts[1:]] - left[line_starts[1:]]
+        wrapped = margin_right[:-1] - line_right[:-1] < first_word + 2 * char_width
+        indented = line_left[1:] - margin_left[1:] > INDENT_CHARS * char_width
+        long_enough = line_ends[:-1] - line_starts[:-1] + 1 >= MIN_REFLOW_WORDS
+        joinable = (wrapped & long_enough & ~indented & ~line_columns[:-1] & ~line_columns[1:]
+                    & ~new_block & (breaks == 0))
+        breaks = np.where(joinable, 1, breaks)
+
+    separators = np.where(columns, '\t', ' ').astype(object)
+    separators = np.concatenate((separators, ['']))
+    for line, kind in enumerate(breaks):
+        last, first = line_ends[line], line_starts[line + 1]
+        word = words[last]
+        # A word hyphenated at the line end continues on the next line,
+        # however much room was left
+        hyphenated = (reflow and kind != 2 and len(word) > 1 and word.endswith('-')
+                      and word[-2].isalpha() and words[first][:1].islower())
+        if hyphenated:
+            words[last] = word[:-1]
+            separators[last] = ''
+        elif kind == 1 and not _LIST_ITEM.match(words[first]):
+            separators[last] = ' '
+        else:
+            separators[last] = '\n\n' if kind == 2 else '\n'
+
+    return ''.join([word + separator for word, separator in zip(words, separators)])
+
+
+def load_dictionary(path):
+    """Read word corrections from a text file
+
+    One correction per line as 'wrong<TAB>right' (or separated by
+    spaces); blank lines and lines starting with '#' are ignored.
+
+    Returns:
+        Dict mapping wrong words to replacements
+    """
+    corrections = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            wrong, _, right = line.partition('\t') if '\t' in line else line.partition(' ')
+            if right.strip():
+                corrections[wrong.strip()] = right.strip()
+    return corrections
+
+
+def _dictionary_rule(corrections):
+    """One alternation regex replacing every dictionary word in a single pass"""
+    if not corrections:
+        return None
+    alternatives = '|'.join(re.escape(word) for word in sorted(corrections, key=len, reverse=True))
+    pattern = re.compile(r'(?<!\w)(?:' + alternatives + r')(?!\w)')
+    return pattern, lambda match: corrections[match.group(0)]
+
+
+def normalize_text(text, rules=DEFAULT_RULES, dictionary=None):
+    """Clean up OCR text
+
+    Typographic ligatures, quotes and special spaces become ASCII,
+    repeated spaces and trailing whitespace are removed, then the named
+    rule sets and the dictionary are applied in that order.
+
+    Args:
+        text: Text to clean
+        rules: Names from RULE_SETS
+        dictionary: Optional mapping of wrong words to replacements
+
+    Returns:
+        Cleaned text
+    """
+    return PostProcessor(rules, dictionary, reflow=False).clean(text)
+
+
+class PostProcessor:
+    """Layout reconstruction and corrections, configured once and reused
+
+    Calling a PostProcessor with an OCRResult returns the reconstructed,
+    cleaned text, so it can be passed to the pipeline's postprocessor
+    argument. Instances only hold compiled patterns and can be pickled to
+    worker processes.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, dictionary=None, reflow=True):
+        """
+        Args:
+            rules: Names from RULE_SETS, applied in order
+            dictionary: Mapping of wrong words to replacements, or a path
+                for load_dictionary()
+            reflow: Join soft-wrapped lines into paragraphs
+        """
+        unknown = [name for name in rules if name not in RULE_SETS]
+        if unknown:
+            raise ValueError(f"Unknown correction rules: {', '.join(unknown)}")
+        if isinstance(dictionary, str):
+            dictionary = load_dictionary(dictionary)
+        self.rules = tuple(rules)
+        self.dictionary = dict(dictionary or {})
+        self.reflow = reflow
+        self._substitutions = list(_WHITESPACE_RULES)
+        for name in self.rules:
+            self._substitutions.extend(RULE_SETS[name])
+        dictionary_rule = _dictionary_rule(self.dictionary)
+        if dictionary_rule is not None:
+            self._substitutions.append(dictionary_rule)
+
+    def __reduce__(self):
+        # The dictionary substitution is a closure; rebuild it on unpickling
+        return PostProcessor, (self.rules, self.dictionary, self.reflow)
+
+    def clean(self, text):
+        """Normalise characters and apply the corrections to plain text"""
+        with get_metrics().timer('postprocess'):
+            text = text.translate(_TRANSLATION)
+            for pattern, replacement in self._substitutions:
+                text = pattern.sub(replacement, text)
+            return text.strip()
+
+    def __call__(self, result):
+        """Reconstruct the layout of an OCRResult and clean the text"""
+        with get_metrics().timer('layout'):
+            text = reconstruct_layout(result, self.reflow)
+        return self.clean(text)
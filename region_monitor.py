@@ -0,0 +1,261 @@
+"""
+Live region monitoring for Live Screen Text Extractor
+Re-captures a screen region at a fixed rate and only runs OCR when the
+pixels actually changed, so dashboards and log tails can be followed
+without paying for OCR on every frame.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from metrics import get_metrics
+from ocr_cache import OCRCache
+from ocr_engine import AUTO_LANGUAGE, DEFAULT_LANGUAGE, DEFAULT_OEM, checkout_engine, detect_language
+from ocr_pipeline import DEFAULT_OCR_CONFIG, LINE_OCR_CONFIG, capture_screen, find_line_bands
+from preprocessing import DEFAULT_PROFILE, get_preprocessor
+
+# A recognised change in a monitored region
+TextEvent = namedtuple('TextEvent', ['timestamp', 'text', 'bbox'])
+
+DEFAULT_WATCH_INTERVAL = 0.5
+
+
+class FrameChangeDetector:
+    """Frame-to-frame change test at full resolution
+
+    Counts the grayscale pixels that moved by more than pixel_threshold,
+    so a single changed glyph (a counter ticking over, a clock's last
+    digit) trips the gate, while capture noise below the threshold does
+    not. Frames are compared against the last frame reported as changed,
+    not the previous one, so changes arriving a few pixels at a time
+    still add up.
+    """
+
+    def __init__(self, pixel_threshold=32, min_pixels=3):
+        """
+        Args:
+            pixel_threshold: Minimum change of a pixel (0-255) that counts
+                as ink moving rather than noise
+            min_pixels: Number of such pixels that makes a change; even a
+                period at small font sizes is larger than this
+        """
+        self.pixel_threshold = pixel_threshold
+        self.min_pixels = min_pixels
+        self._previous = None
+
+    def signature(self, frame):
+        """Grayscale copy of an RGB or grayscale frame for comparison"""
+        if frame.ndim == 3:
+            return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        return np.array(frame, dtype=np.uint8)
+
+    def changed(self, frame):
+        """Return True if frame differs from the last frame reported as changed"""
+        current = self.signature(frame)
+        previous = self._previous
+        if previous is None or previous.shape != current.shape:
+            self._previous = current
+            return True
+        diff = cv2.absdiff(current, previous)
+        if cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255,
+                                          cv2.THRESH_BINARY)[1]) < self.min_pixels:
+            return False
+        self._previous = current
+        return True
+
+    def reset(self):
+        """Forget the previous frame so the next one counts as changed"""
+        self._previous = None
+
+
+class TiledOCR:
+    """Line-tiled OCR that only re-recognises tiles whose pixels changed
+
+    The binarised region is cut into text-line bands. Each band's text is
+    cached under a hash of its pixels, so after an update only new or
+    edited lines go through Tesseract; lines that merely moved (a log
+    scrolling up) are still cache hits.
+    """
+
+    def __init__(self, max_tiles=512, engine=None, cache=None, profile=DEFAULT_PROFILE,
+                 lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+        """
+        Args:
+            max_tiles: Number of tile results kept when no cache is given
+            engine: OCREngine to use; defaults to one checked out of the
+                shared engine pool for lang and oem on each extract()
+            cache: OCRCache holding tile results
+            profile: Preprocessing profile, see preprocessing.PROFILES
+            lang: Tesseract language; 'auto' detects the script on the
+                first frame with text and keeps it
+            oem: Tesseract OCR engine mode
+        """
+        self.engine = engine
+        self.profile = profile
+        self.lang = lang
+        self.oem = oem
+        self.cache = cache or OCRCache(max_entries=max_tiles)
+        self.tiles_seen = 0
+        self.tiles_recognised = 0
+
+    def extract(self, image):
+        """Return the text of image, reusing cached results for unchanged lines"""
+        binary = get_preprocessor().binarize(image, self.profile)
+        bands = find_line_bands(binary)
+        if not bands:
+            return ''
+
+        # Bands much taller than a typical line hold several tightly spaced
+        # lines, which single-line mode would misread
+        line_height = float(np.median([bottom - top for top, bottom in bands]))
+
+        if self.lang == AUTO_LANGUAGE and self.engine is None:
+            with get_metrics().timer('osd'):
+                self.lang = detect_language(binary)
+        if self.engine is not None:
+            return self._recognize_bands(self.engine, binary, bands, line_height)
+        with checkout_engine(self.lang, self.oem) as engine:
+            return self._recognize_bands(engine, binary, bands, line_height)
+
+    def _recognize_bands(self, engine, binary, bands, line_height):
+        lines = []
+        for top, bottom in bands:
+            # Row slices of a C-contiguous array are contiguous: no copy
+            tile = binary[top:bottom]
+            config = LINE_OCR_CONFIG if bottom - top <= 2 * line_height else DEFAULT_OCR_CONFIG
+            key = self.cache.make_key(tile, config, engine.model)
+            self.tiles_seen += 1
+
+            text = self.cache.get(key)
+            if text is None:
+                with get_metrics().timer('ocr'):
+                    text = engine.recognize_array(tile, config=config).strip()
+                self.tiles_recognised += 1
+                self.cache.put(key, text)
+
+            if text:
+                lines.append(text)
+        return '\n'.join(lines)
+
+    def clear(self):
+        """Drop all cached tile results"""
+        self.cache.clear()
+
+
+class RegionMonitor:
+    """Watch a screen region and emit a TextEvent whenever its text changes
+
+    Capture and OCR run on a daemon thread. on_event is called from that
+    thread, so GUI callers should hand events over to the Tk thread.
+    """
+
+    def __init__(self, bbox, on_event, interval=DEFAULT_WATCH_INTERVAL,
+                 grab=None, extract=None, detector=None, on_error=None):
+        """
+        Args:
+            bbox: (x1, y1, x2, y2) screen region to watch
+            on_event: Callable receiving each TextEvent
+            interval: Seconds between captures
+            grab: Callable returning the region as an RGB array or PIL
+                Image; defaults to the monitor thread's capture backend
+            extract: Callable turning an RGB array into text; defaults to
+                a TiledOCR so only changed lines are re-recognised
+            detector: FrameChangeDetector used to gate OCR
+            on_error: Callable receiving exceptions raised while capturing
+                or recognising; monitoring continues afterwards
+        """
+        self.bbox = tuple(bbox)
+        self.on_event = on_event
+        self.interval = interval
+        # Resolved on the monitor thread, which owns its capture backend
+        self.grab = grab or (lambda: capture_screen(self.bbox))
+        self.extract = extract or TiledOCR().extract
+        self.detector = detector or FrameChangeDetector()
+        self.on_error = on_error
+
+        self.frames_captured = 0
+        self.frames_recognised = 0
+        self.last_text = None
+
+        self._stop_event = None
+        self._thread = None
+
+    @property
+    def running(self):
+        """True while the monitoring thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start monitoring on a background thread"""
+        if self.running:
+            return
+        # A fresh event per run, so a previous thread that is still
+        # finishing an OCR call cannot be revived by a restart
+        self._stop_event = threading.Event()
+        self.detector.reset()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,),
+                                        name='region-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Ask the monitoring thread to stop
+
+        Args:
+            timeout: Seconds to wait for the thread to exit; None waits
+                indefinitely, 0 returns immediately
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._thread is not None:
+            if timeout != 0:
+                self._thread.join(timeout)
+            self._thread = None
+
+    def poll_once(self):
+        """Capture one frame and return a TextEvent if its text changed
+
+        Returns None when the frame is unchanged or the text is the same
+        as the last recognised text.
+        """
+        frame = np.asarray(self.grab())
+        self.frames_captured += 1
+
+        if not self.detector.changed(frame):
+            get_metrics().increment('watch_frames_unchanged')
+            return None
+
+        self.frames_recognised += 1
+        try:
+            text = self.extract(frame)
+        except Exception:
+            # Make sure the same frame is retried next time
+            self.detector.reset()
+            raise
+        if text == self.last_text:
+            return None
+
+        self.last_text = text
+        return TextEvent(time.time(), text, self.bbox)
+
+    def _run(self, stop_event):
+        next_capture = time.monotonic()
+        while not stop_event.is_set():
+            try:
+                event = self.poll_once()
+                if event is not None:
+                    self.on_event(event)
+            except Exception as e:
+                # Keep watching through transient capture/OCR failures
+                if self.on_error:
+                    self.on_error(e)
+
+            # Fixed-rate schedule; skip ahead rather than burst if OCR overran
+            next_capture += self.interval
+            delay = next_capture - time.monotonic()
+            if delay < 0:
+                next_capture = time.monotonic()
+                delay = 0
+            stop_event.wait(delay)
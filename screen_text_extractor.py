@@ -1,17 +1,136 @@
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-import cv2
-import numpy as np
-from PIL import Image, ImageTk, ImageGrab
-import pytesseract
-import threading
 import time
 
+# Startup is measured from here until the control panel is on screen
+_IMPORT_START = time.perf_counter()
+
+try:
+    import tkinter as tk
+    from tkinter import ttk, scrolledtext, messagebox, filedialog
+except ImportError:
+    # Python builds without Tk can still use the headless CLI
+    tk = ttk = scrolledtext = messagebox = filedialog = None
+import functools
+import itertools
+import os
+import queue
+import sys
+import threading
+
+# Only lightweight modules are imported here. NumPy, OpenCV, PIL and the
+# OCR engines are loaded by warm_up_ocr() on a worker thread once the
+# panel is showing, or by the first action that needs them.
+from metrics import get_metrics, process_memory
+from ocr_cache import OCRCache, default_cache_path
+from ocr_executor import OCRExecutor
+
+# How often the Tk loop collects finished OCR jobs (milliseconds)
+OCR_POLL_INTERVAL_MS = 50
+
+# Words Tesseract is less sure of than this (0-100) are highlighted
+LOW_CONFIDENCE = 60
+
+# How often the stats pane re-reads the stage timers (milliseconds)
+STATS_REFRESH_MS = 500
+
+# Wait after the panel is unmapped before freezing the screen, for
+# compositors that fade windows out (milliseconds)
+PANEL_HIDE_DELAY_MS = 50
+
+# Languages offered in the panel; any Tesseract code (or 'a+b') can be typed
+LANGUAGE_CHOICES = ('auto', 'eng', 'deu', 'eng+deu', 'chi_sim', 'chi_tra', 'jpn', 'kor')
+OEM_CHOICES = ('default', 'lstm', 'legacy', 'combined')
+
+# Tk event state bit for a held Shift key
+SHIFT_MASK = 0x0001
+
+
+def frame_to_photo(frame):
+    """Wrap an RGB NumPy frame as a Tk PhotoImage
+    
+    The pixels are handed to Tk as a binary PPM, so no PIL Tk binding
+    is needed.
+    """
+    height, width = frame.shape[:2]
+    header = f"P6 {width} {height} 255 ".encode('ascii')
+    return tk.PhotoImage(data=header + frame[:, :, :3].tobytes(), format='PPM')
+
+
+def ocr_options(lang, oem):
+    """Keyword arguments selecting lang and the named OEM for the pipeline"""
+    from ocr_engine import OEM_MODES
+    return {'lang': lang, 'oem': OEM_MODES[oem]}
+
+
+def warm_up_ocr(lang='eng', oem='default'):
+    """Load the OCR stack and check Tesseract; runs on an OCR worker"""
+    from ocr_pipeline import warm_up
+    warm_up(**ocr_options(lang, oem))
+
+
+def capture_text(bbox, cache, lang, oem, fix=False):
+    """Capture a screen region and OCR it in one go; runs on an OCR worker
+    
+    The text goes straight to the clipboard, so its lines are kept as
+    recognised, as in the editor (log and console lines are not joined
+    into paragraphs). The correction rules, which change characters such
+    as l/1 and O/0, are applied only when fix is true.
+    
+    Returns:
+        (text, PackedImage of the capture for the history)
+    """
+    from ocr_pipeline import capture_screen
+    return image_text(capture_screen(bbox), cache, lang, oem, fix)
+
+
+def image_text(image, cache, lang, oem, fix=False):
+    """OCR an already captured image like capture_text(); runs on an OCR worker"""
+    from extraction_history import pack_image
+    from ocr_pipeline import extract_text_from_image
+    from postprocessing import PostProcessor, reconstruct_layout
+    if fix:
+        postprocessor = PostProcessor(reflow=False)
+    else:
+        postprocessor = functools.partial(reconstruct_layout, reflow=False)
+    text = extract_text_from_image(image, cache=cache, postprocessor=postprocessor,
+                                   **ocr_options(lang, oem))
+    return text, pack_image(image)
+
+
+def extract_regions_text(regions, cache, lang, oem):
+    """Capture and OCR several regions at once; runs on an OCR worker"""
+    from ocr_pipeline import extract_regions
+    return extract_regions(regions, cache=cache, **ocr_options(lang, oem))
+
+
+def stream_text(image, cache, stream_id, emit, stop, lang, oem):
+    """OCR image row by row on an OCR worker, emitting rows as they finish
+
+    Each row, a list of OCRResult segments, is passed to
+    emit((stream_id, results)) in reading order; the Tk thread picks
+    them up in process_stream_events. Setting stop ends the stream early.
+    
+    Returns:
+        (stream_id, PackedImage of image for the history, or None when
+        the stream was stopped)
+    """
+    from extraction_history import pack_image
+    from text_detection import iter_results_auto
+    rows = iter_results_auto(image, cache=cache, **ocr_options(lang, oem))
+    try:
+        for row in rows:
+            if stop.is_set():
+                break
+            emit((stream_id, [result for _, result in row]))
+    finally:
+        rows.close()
+    return stream_id, None if stop.is_set() else pack_image(image)
+
+
 class ScreenTextExtractor:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Screen Text Extractor")
-        self.root.geometry("180x160")
+        self.root.geometry("180x410")
         self.root.attributes('-topmost', True)
         self.root.attributes('-alpha', 0.9)
         self.root.resizable(False, False)
@@ -19,9 +138,61 @@ class ScreenTextExtractor:
         # Variables
         self.crop_coords = None
         self.cropped_image = None
+        self.regions = {}
         self.is_cropping = False
         self.overlay_window = None
         
+        # Full screen grabbed when cropping starts; selections are cut out
+        # of it, and it is released when the overlay closes
+        self.frozen_frame = None
+        self.overlay_photo = None
+        
+        # Background OCR workers; results come back through poll_ocr_results
+        self.ocr_executor = OCRExecutor()
+        self.warm_up_job = None
+        
+        # Streaming extractions: rows arrive on stream_events and are
+        # appended to the stream's editor as they are recognised
+        self.stream_events = queue.Queue()
+        self.stream_ids = itertools.count(1)
+        self.streams = {}
+        
+        # Recognised text keyed by preprocessed pixels. The disk tier keeps
+        # screen text across restarts, so it is opt-in (Stats pane); an
+        # existing cache file means it was turned on in an earlier session
+        self.ocr_cache = OCRCache()
+        if os.path.exists(default_cache_path()):
+            self.set_disk_cache(True)
+        
+        # Watch mode; the monitor thread hands events over through a queue
+        self.region_monitor = None
+        self.watch_events = queue.Queue()
+        self.watch_window = None
+        
+        # Recording mode: a second monitor feeding a TextRecorder file
+        self.record_monitor = None
+        self.recorder = None
+        
+        # Quick extraction hotkey: capture the last region, OCR it and copy
+        # the text without dialogs. Presses arrive on hotkey_presses from
+        # the listener thread, stamped with perf_counter() at the keypress
+        self.hotkey = None
+        self.hotkey_presses = queue.Queue()
+        self.quick_job = None
+        self.quick_after_crop = False
+        self.status_note = None
+        
+        # One editor window, reused for every extraction, and a bounded
+        # history of recent results (created with the first one)
+        self.editor_window = None
+        self.text_area = None
+        self.editor_entry = None
+        self.history = None
+        
+        # Optional per-stage timing pane
+        self.stats_window = None
+        self.stats_after_id = None
+        
         # Create floating control panel
         self.create_control_panel()
         
@@ -37,6 +208,28 @@ class ScreenTextExtractor:
         title_label = ttk.Label(main_frame, text="Text Extractor", font=("Arial", 10, "bold"))
         title_label.pack(pady=(0, 10))
         
+        # Recognition language and engine mode; 'auto' detects the script
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(pady=(0, 4))
+        self.lang_var = tk.StringVar(value='eng')
+        self.lang_box = ttk.Combobox(options_frame, textvariable=self.lang_var,
+                                     values=LANGUAGE_CHOICES, width=7)
+        self.lang_box.pack(side=tk.LEFT, padx=(0, 2))
+        self.oem_var = tk.StringVar(value='default')
+        self.oem_box = ttk.Combobox(options_frame, textvariable=self.oem_var,
+                                    values=OEM_CHOICES, width=7, state='readonly')
+        self.oem_box.pack(side=tk.LEFT)
+        # Load the new language's traineddata before it is first needed
+        self.lang_box.bind("<<ComboboxSelected>>", self.prepare_language)
+        self.lang_box.bind("<Return>", self.prepare_language)
+        self.oem_box.bind("<<ComboboxSelected>>", self.prepare_language)
+        
+        # Off by default: the hotkey copies what was recognised, and the
+        # correction rules can turn hashes or identifiers into other text
+        self.fix_text_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="Fix OCR errors",
+                        variable=self.fix_text_var).pack(pady=(0, 4))
+        
         # Buttons
         self.crop_btn = ttk.Button(main_frame, text="📷 Crop", command=self.start_crop, width=15)
         self.crop_btn.pack(pady=2)
@@ -49,6 +242,34 @@ class ScreenTextExtractor:
                                    width=15, state='disabled')
         self.reset_btn.pack(pady=2)
         
+        self.watch_btn = ttk.Button(main_frame, text="👁 Watch", command=self.toggle_watch,
+                                   width=15, state='disabled')
+        self.watch_btn.pack(pady=2)
+        
+        self.record_btn = ttk.Button(main_frame, text="⏺ Record", command=self.toggle_recording,
+                                    width=15, state='disabled')
+        self.record_btn.pack(pady=2)
+        
+        self.add_region_btn = ttk.Button(main_frame, text="➕ Add Region", command=self.add_region,
+                                        width=15, state='disabled')
+        self.add_region_btn.pack(pady=2)
+        
+        self.extract_all_btn = ttk.Button(main_frame, text="📑 Extract All", command=self.extract_all_regions,
+                                         width=15, state='disabled')
+        self.extract_all_btn.pack(pady=2)
+        
+        self.cancel_btn = ttk.Button(main_frame, text="⏹ Cancel", command=self.cancel_extraction,
+                                    width=15, state='disabled')
+        self.cancel_btn.pack(pady=2)
+        
+        self.stats_btn = ttk.Button(main_frame, text="📊 Stats", command=self.toggle_stats,
+                                   width=15)
+        self.stats_btn.pack(pady=2)
+        
+        # In-flight OCR indicator
+        self.status_label = ttk.Label(main_frame, text="Ready", font=("Arial", 8))
+        self.status_label.pack(pady=(6, 0))
+        
         # Make window draggable
         self.make_draggable()
         
@@ -67,24 +288,46 @@ class ScreenTextExtractor:
         self.root.bind("<B1-Motion>", drag)
         
     def start_crop(self):
-        """Start the screen cropping process"""
+        """Freeze the screen and open the selection overlay over the still frame"""
         self.is_cropping = True
         self.crop_btn.config(state='disabled')
         
-        # Hide main window temporarily
+        # Hide the panel so it is not part of the frozen frame. withdraw()
+        # only asks the window manager, so the screen is grabbed once the
+        # panel's <Unmap> event has arrived
+        if not self.root.winfo_viewable():
+            self.root.withdraw()
+            self.root.after_idle(self.freeze_screen)
+            return
+            
+        def on_unmap(event):
+            if event.widget is self.root:
+                self.root.unbind("<Unmap>", binding)
+                self.root.after(PANEL_HIDE_DELAY_MS, self.freeze_screen)
+                
+        binding = self.root.bind("<Unmap>", on_unmap, '+')
         self.root.withdraw()
         
+    def freeze_screen(self):
+        """Grab the full screen into frozen_frame and open the crop overlay on it"""
+        from ocr_pipeline import capture_screen
+        
+        try:
+            self.frozen_frame = capture_screen()
+        except Exception as e:
+            self.cancel_crop()
+            messagebox.showerror("Error", f"Screen capture failed: {str(e)}")
+            return
+            
         # Create fullscreen overlay for cropping
         self.create_crop_overlay()
         
     def create_crop_overlay(self):
-        """Create fullscreen overlay for area selection"""
+        """Create a fullscreen overlay showing the frozen frame for area selection"""
         self.overlay_window = tk.Toplevel()
         self.overlay_window.attributes('-fullscreen', True)
-        self.overlay_window.attributes('-alpha', 0.3)
         self.overlay_window.attributes('-topmost', True)
-        self.overlay_window.configure(bg='black')
-        self.overlay_window.cursor = "crosshair"
+        self.overlay_window.configure(bg='black', cursor="crosshair")
         
         # Variables for rectangle drawing
         self.start_x = None
@@ -92,9 +335,14 @@ class ScreenTextExtractor:
         self.rect_id = None
         
         # Create canvas for drawing selection rectangle
-        self.canvas = tk.Canvas(self.overlay_window, highlightthickness=0)
+        self.canvas = tk.Canvas(self.overlay_window, highlightthickness=0, bg='black')
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # The still frame is what gets cropped, so content that changes
+        # while the user drags does not matter
+        self.overlay_photo = frame_to_photo(self.frozen_frame)
+        self.canvas.create_image(0, 0, image=self.overlay_photo, anchor='nw')
+        
         # Bind mouse events
         self.canvas.bind("<Button-1>", self.on_crop_start)
         self.canvas.bind("<B1-Motion>", self.on_crop_drag)
@@ -102,9 +350,13 @@ class ScreenTextExtractor:
         self.canvas.bind("<Escape>", self.cancel_crop)
         
         # Instructions
-        instruction_text = "Click and drag to select area. Press Escape to cancel."
-        self.canvas.create_text(self.overlay_window.winfo_screenwidth()//2, 50,
-                              text=instruction_text, fill="white", font=("Arial", 16))
+        instruction_text = ("Click and drag to select area. Shift+drag extracts extra areas "
+                            "from the same frame. Press Escape to close.")
+        self.hint_id = self.canvas.create_text(self.overlay_window.winfo_screenwidth()//2, 50,
+                                               text=instruction_text, fill="white", font=("Arial", 16))
+        self.hint_bg_id = self.canvas.create_rectangle(self.canvas.bbox(self.hint_id), fill="black",
+                                                       outline="")
+        self.canvas.tag_lower(self.hint_bg_id, self.hint_id)
         
         self.canvas.focus_set()
         
@@ -139,31 +391,44 @@ class ScreenTextExtractor:
             x1, x2 = min(self.start_x, end_x), max(self.start_x, end_x)
             y1, y2 = min(self.start_y, end_y), max(self.start_y, end_y)
             
-            if abs(x2 - x1) > 10 and abs(y2 - y1) > 10:  # Minimum size check
-                self.crop_coords = (int(x1), int(y1), int(x2), int(y2))
+            self.start_x = self.start_y = None
+            if abs(x2 - x1) <= 10 or abs(y2 - y1) <= 10:  # Minimum size check
+                # The frame is still there, so the user can simply try again
+                if self.rect_id:
+                    self.canvas.delete(self.rect_id)
+                    self.rect_id = None
+                self.canvas.itemconfig(self.hint_id, text="Selection too small. Please select a larger area.")
+                self.canvas.coords(self.hint_bg_id, *self.canvas.bbox(self.hint_id))
+                return
                 
-                # Capture the selected area
-                self.capture_cropped_area()
+            coords = (int(x1), int(y1), int(x2), int(y2))
+            if event.state & SHIFT_MASK:
+                # Extra selection: extract it now and keep the overlay open
+                self.canvas.itemconfig(self.rect_id, outline="green", stipple="")
+                self.rect_id = None
+                self.extract_text(self.crop_from_frame(coords), coords)
+                return
                 
-                # Close overlay and show main window
-                self.close_crop_overlay()
-                self.crop_completed()
-            else:
-                messagebox.showwarning("Selection Too Small", "Please select a larger area.")
-                self.cancel_crop()
+            self.crop_coords = coords
+            # A copy, so the full frame is not kept alive by a view into it
+            self.cropped_image = self.crop_from_frame(coords).copy()
+            
+            # Close overlay and show main window
+            self.close_crop_overlay()
+            self.crop_completed()
                 
-    def capture_cropped_area(self):
-        """Capture the cropped screen area"""
-        if self.crop_coords:
-            x1, y1, x2, y2 = self.crop_coords
-            # Capture screenshot of the selected area
-            self.cropped_image = ImageGrab.grab(bbox=(x1, y1, x2, y2))
+    def crop_from_frame(self, coords):
+        """Cut a selection out of the frozen frame as a NumPy view"""
+        x1, y1, x2, y2 = coords
+        return self.frozen_frame[max(y1, 0):y2, max(x1, 0):x2]
             
     def close_crop_overlay(self):
         """Close the crop overlay window"""
         if self.overlay_window:
             self.overlay_window.destroy()
             self.overlay_window = None
+            self.overlay_photo = None
+        self.frozen_frame = None
             
     def cancel_crop(self, event=None):
         """Cancel cropping operation"""
@@ -171,6 +436,7 @@ class ScreenTextExtractor:
         self.root.deiconify()
         self.crop_btn.config(state='normal')
         self.is_cropping = False
+        self.quick_after_crop = False
         
     def crop_completed(self):
         """Handle successful crop completion"""
@@ -178,56 +444,570 @@ class ScreenTextExtractor:
         self.crop_btn.config(state='normal')
         self.extract_btn.config(state='normal')
         self.reset_btn.config(state='normal')
+        self.watch_btn.config(state='normal')
+        self.record_btn.config(state='normal')
+        self.add_region_btn.config(state='normal')
         self.is_cropping = False
         
-        # Show success message
-        messagebox.showinfo("Crop Complete", "Area selected! Click Extract to get text.")
+        if self.quick_after_crop:
+            # The hotkey started this crop: extract straight away
+            self.quick_after_crop = False
+            self.quick_extract(time.perf_counter(), self.cropped_image)
+        else:
+            self.status_note = "Area selected"
+            self.update_ocr_indicator()
         
-    def extract_text(self):
-        """Extract text from cropped image using OCR"""
-        if not self.cropped_image:
+    def extract_text(self, image=None, bbox=None):
+        """Queue OCR of an image (default: the cropped one) on the background workers"""
+        if image is None:
+            image, bbox = self.cropped_image, self.crop_coords
+        if image is None:
             messagebox.showerror("Error", "No cropped area available.")
             return
             
+        stream_id = next(self.stream_ids)
+        stop = threading.Event()
+        # lines keeps the text for the history in case the stream loses
+        # the editor to a newer extraction before it finishes
+        self.streams[stream_id] = {'stop': stop, 'text_area': None, 'bbox': bbox,
+                                   'lines': [], 'detached': False}
         try:
-            # Disable extract button during processing
-            self.extract_btn.config(state='disabled', text="Processing...")
-            self.root.update()
+            self.ocr_executor.submit(stream_text, image, self.ocr_cache,
+                                     stream_id, self.stream_events.put, stop, *self.ocr_selection(),
+                                     on_done=self.on_stream_finished,
+                                     on_error=lambda error: self.on_stream_failed(stream_id, error))
+        except Exception as e:
+            del self.streams[stream_id]
+            messagebox.showerror("Error", f"Text extraction failed: {str(e)}")
+        self.update_ocr_indicator()
+        
+    def process_stream_events(self):
+        """Append streamed rows to their editors, opening one on the first row"""
+        while True:
+            try:
+                stream_id, results = self.stream_events.get_nowait()
+            except queue.Empty:
+                return
+                
+            stream = self.streams.get(stream_id)
+            if stream is None:
+                continue
+            stream['lines'].append("\t".join(result.text for result in results))
+            if stream['detached']:
+                continue
+            text_area = stream['text_area']
+            if text_area is None:
+                text_area = stream['text_area'] = self.show_text_editor("")
+                text_area.winfo_toplevel().title("Extracted Text - Recognising...")
+                # Kept so Tidy can rebuild the layout from the word boxes
+                text_area.ocr_rows = []
+            else:
+                text_area.insert(tk.END, "\n")
+            self.insert_results(text_area, results)
+            if text_area.ocr_rows is not None:
+                text_area.ocr_rows.append(results)
+                # Only the user's own edits should count as modifications
+                text_area.edit_modified(False)
             
-            # Convert PIL image to OpenCV format for preprocessing
-            img_array = np.array(self.cropped_image)
-            img_cv = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+    def insert_results(self, text_area, results):
+        """Append one row of OCR results, highlighting uncertain words
+        
+        Segments are separated by tabs. Highlights come from the word
+        confidences recognition already produced, so they cost no extra
+        OCR pass.
+        """
+        text_area.tag_configure("low_confidence", background="#ffe08a")
+        for i, result in enumerate(results):
+            if i:
+                text_area.insert(tk.END, "\t")
+            start = text_area.index("end-1c")
+            text_area.insert(tk.END, result.text)
+            for word in result.low_confidence(LOW_CONFIDENCE):
+                text_area.tag_add("low_confidence",
+                                  f"{start} + {result.starts[word]} chars",
+                                  f"{start} + {result.ends[word]} chars")
+                
+    def on_stream_finished(self, finished):
+        """Finish a streaming extraction once its last row has been shown
+        
+        Streams whose editor was closed have already been dropped from
+        self.streams and are ignored here. Streams that lost the editor to
+        a newer extraction go to the history without being shown.
+        """
+        stream_id, packed = finished
+        self.process_stream_events()
+        stream = self.streams.pop(stream_id, None)
+        if stream is None:
+            return
+        text_area = stream['text_area']
+        if stream['detached']:
+            self.remember("\n".join(stream['lines']), packed, stream['bbox'])
+            self.update_history_nav()
+        elif text_area is None:
+            messagebox.showwarning("No Text Found", "No text could be extracted from the selected area.")
+        elif text_area.winfo_exists():
+            text_area.winfo_toplevel().title("Extracted Text - Edit & Copy")
+            self.editor_entry = self.remember(text_area.get("1.0", "end-1c"), packed, stream['bbox'])
+            self.update_history_nav()
             
-            # Preprocess image for better OCR
-            gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+    def on_stream_failed(self, stream_id, error):
+        """Report a streaming extraction that raised; rows already shown stay"""
+        self.process_stream_events()
+        self.streams.pop(stream_id, None)
+        self.on_extraction_failed(error)
+        
+    def on_extraction_failed(self, error):
+        """Report an OCR job that raised an exception"""
+        messagebox.showerror("Error", f"Text extraction failed: {str(error)}")
+        
+    def cancel_extraction(self):
+        """Cancel all queued and running OCR jobs"""
+        self.ocr_executor.cancel_all()
+        for stream in self.streams.values():
+            stream['stop'].set()
+            # The rows already shown stay; only the title still says recognising
+            text_area = stream['text_area']
+            if text_area is not None and text_area.winfo_exists():
+                text_area.winfo_toplevel().title("Extracted Text - Cancelled")
+        self.streams.clear()
+        self.warm_up_job = None
+        self.quick_job = None
+        self.update_ocr_indicator()
+        
+    def start_warm_up(self):
+        """Record startup time and load the OCR stack in the background"""
+        get_metrics().record('startup', (time.perf_counter() - _IMPORT_START) * 1000)
+        self.warm_up_job = self.ocr_executor.submit(warm_up_ocr, *self.ocr_selection(),
+                                                    on_done=self.on_warm_up_done,
+                                                    on_error=self.on_warm_up_failed)
+        self.update_ocr_indicator()
+        
+    def ocr_selection(self):
+        """(language, OEM name) chosen in the panel"""
+        return self.lang_var.get().strip() or 'eng', self.oem_var.get()
+        
+    def prepare_language(self, event=None):
+        """Load the selected language on a worker so the next extraction starts warm
+        
+        Engines stay pooled per language and OEM, so switching back to a
+        language used recently costs nothing.
+        """
+        if self.warm_up_job is not None:
+            return
+        self.ocr_executor.submit(warm_up_ocr, *self.ocr_selection(),
+                                 on_error=lambda error: None)
+        
+    def on_warm_up_done(self, _result):
+        """The OCR stack is loaded and Tesseract answered"""
+        self.warm_up_job = None
+        get_metrics().record('ocr_ready', (time.perf_counter() - _IMPORT_START) * 1000)
+        
+    def on_warm_up_failed(self, error):
+        """Tell the user Tesseract is missing; the panel stays usable"""
+        self.warm_up_job = None
+        messagebox.showerror(
+            "Tesseract Not Found", 
+            "Tesseract OCR is required. Please install it:\n\n"
+            "Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki\n"
+            "Mac: brew install tesseract\n"
+            "Linux: sudo apt install tesseract-ocr\n\n"
+            f"({error})"
+        )
+        
+    def poll_ocr_results(self):
+        """Deliver finished OCR jobs on the Tk thread and reschedule"""
+        try:
+            self.process_stream_events()
+            self.ocr_executor.poll()
+            self.process_watch_events()
+            self.process_hotkey_presses()
+            self.update_ocr_indicator()
+        finally:
+            self.root.after(OCR_POLL_INTERVAL_MS, self.poll_ocr_results)
+        
+    def update_ocr_indicator(self):
+        """Reflect the number of in-flight OCR jobs in the control panel"""
+        in_flight = self.ocr_executor.in_flight
+        if self.warm_up_job is not None:
+            in_flight -= 1
+        if in_flight > 0:
+            self.status_label.config(text=f"Processing {in_flight}...")
+            self.cancel_btn.config(state='normal')
+        elif self.warm_up_job is not None:
+            self.status_label.config(text="Loading OCR...")
+            self.cancel_btn.config(state='disabled')
+        else:
+            self.status_label.config(text=self.status_note or "Ready")
+            self.cancel_btn.config(state='disabled')
             
-            # Apply thresholding to get better text recognition
-            _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    def start_hotkey(self):
+        """Register the quick extraction hotkey
+        
+        Without a global hook (pynput missing, or no display it can use)
+        the same keys work while the control panel has focus.
+        """
+        from hotkeys import QUICK_EXTRACT_HOTKEY, GlobalHotkey, HotkeyError, tk_sequence
+        
+        self.hotkey = GlobalHotkey(QUICK_EXTRACT_HOTKEY, self.hotkey_presses.put)
+        try:
+            self.hotkey.start()
+        except HotkeyError:
+            self.hotkey = None
+            self.root.bind_all(tk_sequence(QUICK_EXTRACT_HOTKEY),
+                               lambda event: self.quick_extract(time.perf_counter()))
             
-            # Convert back to PIL Image
-            processed_image = Image.fromarray(thresh)
+    def process_hotkey_presses(self):
+        """Run quick extraction for presses queued by the global hotkey"""
+        pressed_at = None
+        while True:
+            try:
+                pressed_at = self.hotkey_presses.get_nowait()
+            except queue.Empty:
+                break
+        # Repeated presses while the loop was busy collapse into one
+        if pressed_at is not None:
+            self.quick_extract(pressed_at)
             
-            # Extract text using Tesseract
-            extracted_text = pytesseract.image_to_string(processed_image, config='--psm 6')
+    def quick_extract(self, pressed_at, image=None):
+        """Capture the last region, OCR it and copy the text, without dialogs
+        
+        With no region yet, the crop overlay opens first and the selection
+        is passed in as image, cut from the frozen frame, once it is made.
+        The time from pressed_at until the text is on the clipboard is
+        recorded as the 'hotkey' stage in the Stats pane.
+        """
+        if self.is_cropping or self.quick_job is not None:
+            return
+        if not self.crop_coords:
+            self.quick_after_crop = True
+            self.start_crop()
+            return
+            
+        def on_done(result):
+            self.quick_job = None
+            self.on_quick_extract_done(result, pressed_at)
             
-            # Re-enable extract button
-            self.extract_btn.config(state='normal', text="🔍 Extract")
+        def on_error(error):
+            self.quick_job = None
+            self.status_note = f"Extract failed: {error}"
             
-            if extracted_text.strip():
-                self.show_text_editor(extracted_text.strip())
+        if image is not None:
+            self.quick_job = self.ocr_executor.submit(image_text, image, self.ocr_cache,
+                                                      *self.ocr_selection(), self.fix_text_var.get(),
+                                                      on_done=on_done, on_error=on_error)
+        else:
+            self.quick_job = self.ocr_executor.submit(capture_text, self.crop_coords, self.ocr_cache,
+                                                      *self.ocr_selection(), self.fix_text_var.get(),
+                                                      on_done=on_done, on_error=on_error)
+        self.update_ocr_indicator()
+        
+    def on_quick_extract_done(self, result, pressed_at):
+        """Put quick extraction text on the clipboard and report the latency"""
+        text, packed = result
+        text = text.strip()
+        if not text:
+            self.status_note = "No text found"
+            return
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.root.update_idletasks()
+        elapsed_ms = (time.perf_counter() - pressed_at) * 1000
+        get_metrics().record('hotkey', elapsed_ms)
+        self.status_note = f"Copied ({elapsed_ms:.0f} ms)"
+        self.remember(text, packed, self.crop_coords)
+        self.update_history_nav()
+        
+    def remember(self, text, image=None, bbox=None):
+        """Add an extraction to the bounded history and return its entry"""
+        if self.history is None:
+            from extraction_history import ExtractionHistory
+            self.history = ExtractionHistory()
+        return self.history.add(text, image, bbox)
+            
+    def add_region(self):
+        """Add the current crop to the named regions used by Extract All"""
+        if not self.crop_coords:
+            return
+        name = f"Region {len(self.regions) + 1}"
+        self.regions[name] = self.crop_coords
+        self.extract_all_btn.config(state='normal', text=f"📑 Extract All ({len(self.regions)})")
+        
+    def extract_all_regions(self):
+        """Capture every saved region in one grab and OCR them in parallel"""
+        if not self.regions:
+            messagebox.showerror("Error", "No regions added.")
+            return
+            
+        self.ocr_executor.submit(extract_regions_text, dict(self.regions), self.ocr_cache,
+                                 *self.ocr_selection(),
+                                 on_done=self.on_regions_extracted,
+                                 on_error=self.on_extraction_failed)
+        self.update_ocr_indicator()
+        
+    def on_regions_extracted(self, results):
+        """Show a finished batch extraction, one section per region"""
+        sections = []
+        for result in results:
+            if result.error is not None:
+                body = f"(extraction failed: {result.error})"
             else:
-                messagebox.showwarning("No Text Found", "No text could be extracted from the selected area.")
+                body = result.text or "(no text found)"
+            sections.append(f"== {result.name} ==\n{body}")
+        text = "\n\n".join(sections)
+        self.show_text_editor(text)
+        self.editor_entry = self.remember(text)
+        self.update_history_nav()
+        
+    def toggle_watch(self):
+        """Start or stop continuous monitoring of the cropped area"""
+        if self.region_monitor and self.region_monitor.running:
+            self.stop_watch()
+        else:
+            self.start_watch()
+            
+    def start_watch(self):
+        """Re-capture the cropped area continuously and OCR it when it changes"""
+        if not self.crop_coords:
+            messagebox.showerror("Error", "No cropped area available.")
+            return
+            
+        from region_monitor import RegionMonitor, TiledOCR
+        
+        self.region_monitor = RegionMonitor(self.crop_coords,
+                                            on_event=self.watch_events.put,
+                                            extract=TiledOCR(**ocr_options(*self.ocr_selection())).extract,
+                                            on_error=self.watch_events.put)
+        self.region_monitor.start()
+        self.watch_btn.config(text="⏸ Stop Watch")
+        self.show_watch_window()
+        
+    def stop_watch(self):
+        """Stop monitoring without waiting for an in-progress OCR call"""
+        if self.region_monitor:
+            self.region_monitor.stop(timeout=0)
+            self.region_monitor = None
+        self.watch_btn.config(text="👁 Watch")
+        
+    def toggle_recording(self):
+        """Start or stop recording the cropped area's text to a file"""
+        if self.recorder:
+            self.stop_recording()
+        else:
+            self.start_recording()
+            
+    def start_recording(self):
+        """Ask for a recording file and log every text change of the cropped area"""
+        if not self.crop_coords:
+            messagebox.showerror("Error", "No cropped area available.")
+            return
+            
+        from region_monitor import RegionMonitor, TiledOCR
+        from text_recorder import RECORDING_EXTENSION, TextRecorder
+        
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title="Record Text To",
+            defaultextension=RECORDING_EXTENSION,
+            filetypes=[("Text recordings", f"*{RECORDING_EXTENSION}"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.recorder = TextRecorder(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Cannot record to {path}: {e}")
+            return
+            
+        self.record_monitor = RegionMonitor(self.crop_coords,
+                                            on_event=self.recorder.record_event,
+                                            extract=TiledOCR(**ocr_options(*self.ocr_selection())).extract,
+                                            on_error=self.watch_events.put)
+        self.record_monitor.start()
+        self.record_btn.config(text="⏹ Stop Recording")
+        
+    def stop_recording(self):
+        """Stop recording; a capture still in progress is dropped"""
+        if self.record_monitor:
+            self.record_monitor.stop(timeout=0)
+            self.record_monitor = None
+        if self.recorder:
+            # The recorder ignores records that arrive after close()
+            self.recorder.close()
+            self.recorder = None
+        self.record_btn.config(text="⏺ Record")
+        
+    def process_watch_events(self):
+        """Append queued watch-mode events to the live text window"""
+        while True:
+            try:
+                event = self.watch_events.get_nowait()
+            except queue.Empty:
+                return
                 
+            if not self.watch_window:
+                continue
+            # The monitor queues a TextEvent or the exception it hit
+            if isinstance(event, Exception):
+                entry = f"[{time.strftime('%H:%M:%S')}] Capture failed: {event}\n\n"
+            else:
+                stamp = time.strftime("%H:%M:%S", time.localtime(event.timestamp))
+                entry = f"[{stamp}]\n{event.text}\n\n"
+            self.watch_text.insert(tk.END, entry)
+            self.watch_text.see(tk.END)
+            
+    def show_watch_window(self):
+        """Show the live text window that receives watch-mode updates"""
+        if self.watch_window:
+            self.watch_window.lift()
+            return
+            
+        self.watch_window = tk.Toplevel(self.root)
+        self.watch_window.title("Live Text - Watching")
+        self.watch_window.geometry("500x400")
+        self.watch_window.attributes('-topmost', True)
+        self.watch_window.protocol("WM_DELETE_WINDOW", self.close_watch_window)
+        
+        main_frame = ttk.Frame(self.watch_window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.watch_text = scrolledtext.ScrolledText(
+            main_frame,
+            wrap=tk.WORD,
+            width=60,
+            height=20,
+            font=("Consolas", 10)
+        )
+        self.watch_text.pack(fill=tk.BOTH, expand=True)
+        
+    def close_watch_window(self):
+        """Close the live text window and stop watching"""
+        self.stop_watch()
+        if self.watch_window:
+            self.watch_window.destroy()
+            self.watch_window = None
+            self.watch_text = None
+            
+    def toggle_stats(self):
+        """Open or close the per-stage timing pane"""
+        if self.stats_window:
+            self.close_stats_window()
+        else:
+            self.show_stats_window()
+            
+    def show_stats_window(self):
+        """Show live capture/preprocessing/OCR timings and counters"""
+        self.stats_window = tk.Toplevel(self.root)
+        self.stats_window.title("Pipeline Stats")
+        self.stats_window.geometry("460x300")
+        self.stats_window.attributes('-topmost', True)
+        self.stats_window.protocol("WM_DELETE_WINDOW", self.close_stats_window)
+        
+        main_frame = ttk.Frame(self.stats_window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.stats_label = ttk.Label(main_frame, font=("Consolas", 9), justify=tk.LEFT, anchor=tk.NW)
+        self.stats_label.pack(fill=tk.BOTH, expand=True)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+        
+        copy_btn = ttk.Button(button_frame, text="📋 Copy JSON", command=self.copy_stats_json)
+        copy_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        reset_btn = ttk.Button(button_frame, text="Reset", command=get_metrics().reset)
+        reset_btn.pack(side=tk.LEFT)
+        
+        self.disk_cache_var = tk.BooleanVar(value=self.ocr_cache.disk_path is not None)
+        disk_cache_check = ttk.Checkbutton(
+            button_frame, text="Keep results on disk", variable=self.disk_cache_var,
+            command=lambda: self.disk_cache_var.set(self.set_disk_cache(self.disk_cache_var.get())))
+        disk_cache_check.pack(side=tk.RIGHT)
+        
+        self.refresh_stats()
+        
+    def refresh_stats(self):
+        """Redraw the stats pane and reschedule while it is open"""
+        if not self.stats_window:
+            return
+            
+        snapshot = get_metrics().snapshot()
+        lines = [f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'last ms':>10}"]
+        for stage, stats in sorted(snapshot['stages'].items()):
+            lines.append(f"{stage:<12}{stats['count']:>7}{stats['p50_ms']:>10.1f}"
+                         f"{stats['p95_ms']:>10.1f}{stats['last_ms']:>10.1f}")
+        if snapshot['counters']:
+            lines.append("")
+            lines.extend(f"{name}: {value}" for name, value in sorted(snapshot['counters'].items()))
+        lines.append("")
+        lines.append(f"workers: {self.ocr_executor.max_workers}   in flight: {self.ocr_executor.in_flight}")
+        rss = process_memory()
+        history = self.history
+        lines.append(f"memory: {rss / 1048576:.1f} MB" if rss is not None else "memory: unknown")
+        lines.append(f"history: {len(history) if history else 0} entries, "
+                     f"{(history.nbytes if history else 0) / 1024:.0f} KB")
+        self.stats_label.config(text="\n".join(lines))
+        
+        self.stats_after_id = self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+        
+    def set_disk_cache(self, enabled):
+        """Turn the on-disk OCR cache on, or off and delete its file
+        
+        Returns:
+            Whether the disk tier is on afterwards
+        """
+        try:
+            if enabled:
+                self.ocr_cache.open_disk(default_cache_path())
+            else:
+                self.ocr_cache.remove_disk()
         except Exception as e:
-            self.extract_btn.config(state='normal', text="🔍 Extract")
-            messagebox.showerror("Error", f"Text extraction failed: {str(e)}")
+            if self.stats_window:
+                messagebox.showerror("Error", f"OCR cache: {e}")
+        return self.ocr_cache.disk_path is not None
+        
+    def copy_stats_json(self):
+        """Copy the current timings and counters to the clipboard as JSON"""
+        self.root.clipboard_clear()
+        self.root.clipboard_append(get_metrics().to_json(indent=2))
+        
+    def close_stats_window(self):
+        """Close the stats pane; timers keep running"""
+        if self.stats_after_id:
+            self.root.after_cancel(self.stats_after_id)
+            self.stats_after_id = None
+        if self.stats_window:
+            self.stats_window.destroy()
+            self.stats_window = None
+            self.stats_label = None
             
     def show_text_editor(self, text):
-        """Show extracted text in an editable window"""
-        editor_window = tk.Toplevel(self.root)
-        editor_window.title("Extracted Text - Edit & Copy")
+        """Show extracted text in the editor window and return its text widget
+        
+        The window is created once and reused: a new extraction replaces
+        the text instead of opening another window. A stream still writing
+        into it carries on in the background and is added to the history
+        when it finishes.
+        """
+        if self.editor_window is None:
+            self.create_text_editor()
+        else:
+            self.release_editor()
+            self.text_area.delete("1.0", tk.END)
+            self.editor_window.deiconify()
+            self.editor_window.lift()
+        self.editor_window.title("Extracted Text - Edit & Copy")
+        self.text_area.insert(tk.END, text)
+        self.text_area.ocr_rows = None
+        self.text_area.edit_modified(False)
+        self.editor_entry = None
+        self.update_history_nav()
+        self.text_area.focus_set()
+        return self.text_area
+        
+    def create_text_editor(self):
+        """Build the editor window; closing it only hides it"""
+        editor_window = self.editor_window = tk.Toplevel(self.root)
         editor_window.geometry("500x400")
         editor_window.attributes('-topmost', True)
+        editor_window.protocol("WM_DELETE_WINDOW", self.close_text_editor)
         
         # Position near the main window
         main_x = self.root.winfo_x()
@@ -238,9 +1018,19 @@ class ScreenTextExtractor:
         main_frame = ttk.Frame(editor_window, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Title
-        title_label = ttk.Label(main_frame, text="Extracted Text", font=("Arial", 12, "bold"))
-        title_label.pack(anchor=tk.W, pady=(0, 5))
+        # Title, with buttons to page through recent extractions
+        title_frame = ttk.Frame(main_frame)
+        title_frame.pack(fill=tk.X, pady=(0, 5))
+        title_label = ttk.Label(title_frame, text="Extracted Text", font=("Arial", 12, "bold"))
+        title_label.pack(side=tk.LEFT)
+        self.history_next_btn = ttk.Button(title_frame, text="▶", width=3,
+                                           command=lambda: self.show_history_entry(1))
+        self.history_next_btn.pack(side=tk.RIGHT)
+        self.history_prev_btn = ttk.Button(title_frame, text="◀", width=3,
+                                           command=lambda: self.show_history_entry(-1))
+        self.history_prev_btn.pack(side=tk.RIGHT)
+        self.history_label = ttk.Label(title_frame, font=("Arial", 8))
+        self.history_label.pack(side=tk.RIGHT, padx=5)
         
         # Text area with scrollbar
         self.text_area = scrolledtext.ScrolledText(
@@ -251,7 +1041,6 @@ class ScreenTextExtractor:
             font=("Consolas", 10)
         )
         self.text_area.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        self.text_area.insert(tk.END, text)
         
         # Button frame
         button_frame = ttk.Frame(main_frame)
@@ -270,12 +1059,105 @@ class ScreenTextExtractor:
                              command=lambda: self.text_area.delete("1.0", tk.END))
         clear_btn.pack(side=tk.LEFT, padx=(0, 5))
         
+        tidy_btn = ttk.Button(button_frame, text="🧹 Tidy",
+                             command=lambda: self.tidy_text(self.text_area))
+        tidy_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        # OCR the remembered crop again, e.g. after switching language
+        self.reextract_btn = ttk.Button(button_frame, text="Re-extract",
+                                        command=self.reextract_entry, state='disabled')
+        self.reextract_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
         close_btn = ttk.Button(button_frame, text="Close", 
-                             command=editor_window.destroy)
+                             command=self.close_text_editor)
         close_btn.pack(side=tk.RIGHT)
         
-        # Focus on text area
-        self.text_area.focus_set()
+    def release_editor(self, stop=False):
+        """Detach streams still writing into the editor
+        
+        Detached streams keep recognising and are remembered in the
+        history when they finish; with stop they are stopped and
+        forgotten instead.
+        """
+        for stream_id, stream in list(self.streams.items()):
+            if stream['text_area'] is None:
+                continue
+            if stop:
+                stream['stop'].set()
+                del self.streams[stream_id]
+            else:
+                stream['text_area'] = None
+                stream['detached'] = True
+                
+    def close_text_editor(self):
+        """Hide the editor for reuse, stopping its stream and dropping its text"""
+        self.release_editor(stop=True)
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.ocr_rows = None
+        self.editor_entry = None
+        self.editor_window.withdraw()
+        
+    def show_history_entry(self, step):
+        """Show the extraction step entries older (-1) or newer (+1) than the current one"""
+        entries = list(self.history) if self.history else []
+        if not entries:
+            return
+        position = next((i for i, entry in enumerate(entries) if entry is self.editor_entry), None)
+        if position is None:
+            # Showing something not in the history: start from the newest
+            position = len(entries) if step < 0 else len(entries) - 1
+        position = min(max(position + step, 0), len(entries) - 1)
+        entry = entries[position]
+        
+        self.show_text_editor(entry.text)
+        stamp = time.strftime("%H:%M:%S", time.localtime(entry.timestamp))
+        self.editor_window.title(f"Extracted Text - {stamp}")
+        self.editor_entry = entry
+        self.update_history_nav()
+        
+    def reextract_entry(self):
+        """OCR the shown history entry's crop again with the current language and mode"""
+        entry = self.editor_entry
+        if entry is None or entry.image is None:
+            return
+        from extraction_history import unpack_image
+        self.extract_text(unpack_image(entry.image), entry.bbox)
+        
+    def update_history_nav(self):
+        """Show the editor's position in the history and enable its buttons"""
+        if self.editor_window is None:
+            return
+        entry = self.editor_entry
+        self.reextract_btn.config(state='normal' if entry is not None and entry.image is not None
+                                  else 'disabled')
+        entries = list(self.history) if self.history else []
+        position = next((i for i, entry in enumerate(entries) if entry is self.editor_entry), None)
+        if position is None:
+            self.history_label.config(text=f"{len(entries)} earlier" if entries else "")
+            self.history_prev_btn.config(state='normal' if entries else 'disabled')
+            self.history_next_btn.config(state='disabled')
+        else:
+            self.history_label.config(text=f"{position + 1}/{len(entries)}")
+            self.history_prev_btn.config(state='normal' if position > 0 else 'disabled')
+            self.history_next_btn.config(state='normal' if position < len(entries) - 1 else 'disabled')
+            
+    def tidy_text(self, text_area):
+        """Rejoin paragraphs and columns and fix common OCR confusions
+        
+        While the text is unedited it is rebuilt from the word boxes
+        recognition produced; otherwise the current text is cleaned as is.
+        """
+        from postprocessing import PostProcessor
+        
+        processor = PostProcessor()
+        rows = getattr(text_area, 'ocr_rows', None)
+        if rows and not text_area.edit_modified():
+            text = "\n".join("\t".join(processor(result) for result in row) for row in rows)
+        else:
+            text = processor.clean(text_area.get("1.0", "end-1c"))
+        text_area.delete("1.0", tk.END)
+        text_area.insert(tk.END, text)
+        text_area.ocr_rows = None
         
     def copy_to_clipboard(self, window):
         """Copy text from editor to clipboard"""
@@ -289,35 +1171,58 @@ class ScreenTextExtractor:
             
     def reset_crop(self):
         """Reset the crop selection"""
+        self.close_watch_window()
+        self.stop_recording()
+        self.status_note = None
         self.crop_coords = None
         self.cropped_image = None
+        self.regions = {}
         self.extract_btn.config(state='disabled')
         self.reset_btn.config(state='disabled')
+        self.watch_btn.config(state='disabled')
+        self.record_btn.config(state='disabled')
+        self.add_region_btn.config(state='disabled')
+        self.extract_all_btn.config(state='disabled', text="📑 Extract All")
         messagebox.showinfo("Reset", "Crop selection cleared. Ready for new selection.")
         
     def run(self):
         """Start the application"""
-        # Check if Tesseract is available
-        try:
-            pytesseract.get_tesseract_version()
-        except Exception:
-            messagebox.showerror(
-                "Tesseract Not Found", 
-                "Tesseract OCR is required. Please install it:\n\n"
-                "Windows: Download from https://github.com/UB-Mannheim/tesseract/wiki\n"
-                "Mac: brew install tesseract\n"
-                "Linux: sudo apt install tesseract-ocr"
-            )
-            return
-            
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(OCR_POLL_INTERVAL_MS, self.poll_ocr_results)
+        # Runs once the panel is drawn, so the Tesseract check never delays it
+        self.root.after_idle(self.start_warm_up)
+        self.root.after_idle(self.start_hotkey)
         self.root.mainloop()
         
     def on_closing(self):
         """Handle application closing"""
         if messagebox.askokcancel("Quit", "Do you want to quit the Text Extractor?"):
+            self.stop_watch()
+            self.stop_recording()
+            if self.hotkey:
+                self.hotkey.stop()
+            # Stop running streams too, or interpreter exit waits for them
+            # to work through every remaining line
+            self.cancel_extraction()
+            self.ocr_executor.shutdown()
+            self.ocr_cache.close()
             self.root.destroy()
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Open the control panel, or run the headless CLI when given arguments"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        import ocr_cli
+        return ocr_cli.main(argv)
+        
+    if tk is None:
+        print("tkinter is not available; use the command line options instead (see --help).",
+              file=sys.stderr)
+        return 1
+        
     app = ScreenTextExtractor()
-    app.run()
\ No newline at end of file
+    app.run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -24,6 +24,25 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/live-screen-text-extractor",
     packages=find_packages(),
+    py_modules=[
+        'screen_text_extractor',
+        'batch_ocr',
+        'capture_backends',
+        'extraction_history',
+        'hotkeys',
+        'metrics',
+        'ocr_cache',
+        'ocr_cli',
+        'ocr_engine',
+        'ocr_executor',
+        'ocr_pipeline',
+        'ocr_result',
+        'postprocessing',
+        'preprocessing',
+        'region_monitor',
+        'text_detection',
+        'text_recorder',
+    ],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: End Users/Desktop",
@@ -58,6 +77,7 @@ setup(
     entry_points={
         'console_scripts': [
             'screen-text-extractor=screen_text_extractor:main',
+            'screen-text-extractor-cli=ocr_cli:main',
         ],
     },
     keywords="ocr text-extraction screen-capture tesseract gui desktop-application",
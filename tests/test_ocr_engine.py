@@ -0,0 +1,77 @@
+"""
+Tests for the process-wide OCR engine pool (ocr_engine.EnginePool)
+No Tesseract is needed: create_engine is replaced by a fake engine.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import ocr_engine  # noqa: E402
+from ocr_engine import EnginePool  # noqa: E402
+
+
+class FakeEngine:
+    def __init__(self, lang):
+        self.lang = lang
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def run_concurrently(pool, lang, jobs, hold=0.02):
+    """Check out an engine for lang from jobs threads at once; return peak concurrency"""
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+    start = threading.Barrier(jobs)
+
+    def job():
+        start.wait()
+        engine = pool.acquire(None, lang, 3)
+        try:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(hold)
+            with lock:
+                active[0] -= 1
+        finally:
+            pool.release(None, lang, 3, engine)
+
+    threads = [threading.Thread(target=job) for _ in range(jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return peak[0]
+
+
+def test_second_language_evicts_idle_engines(monkeypatch):
+    monkeypatch.setattr(ocr_engine, 'create_engine',
+                        lambda backend, lang, oem=3: FakeEngine(lang))
+    pool = EnginePool(max_engines=8)
+
+    # One large extraction leaves the pool full of idle 'eng' engines
+    assert run_concurrently(pool, 'eng', 8, hold=0.05) == 8
+    assert sum(pool._loaded.values()) == 8
+
+    assert run_concurrently(pool, 'deu', 8) > 1
+    assert sum(pool._loaded.values()) <= 8
+
+
+def test_pool_never_exceeds_max_engines(monkeypatch):
+    created = []
+
+    def create(backend, lang, oem=3):
+        created.append(lang)
+        return FakeEngine(lang)
+
+    monkeypatch.setattr(ocr_engine, 'create_engine', create)
+    pool = EnginePool(max_engines=2)
+    assert run_concurrently(pool, 'eng', 6) == 2
+    assert len(created) == 2
@@ -0,0 +1,43 @@
+"""
+Tests for automatic preprocessing profile selection (preprocessing.select_profile)
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from preprocessing import select_profile  # noqa: E402
+
+LINES = [
+    "2026-10-18 12:00:01 INFO server started on port 8080",
+    "The quick brown fox jumps over the lazy dog",
+    "Total: 1,234.56 EUR (incl. VAT)",
+    "def extract(image): return image.text",
+]
+
+
+def render_page(scale, line_height, background=255):
+    """Grayscale page of LINES drawn with OpenCV's built-in font"""
+    page = np.full((line_height * len(LINES) + 20, 700), background, dtype=np.uint8)
+    for i, line in enumerate(LINES):
+        baseline = 10 + (i + 1) * line_height - line_height // 4
+        cv2.putText(page, line, (10, baseline), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, 1,
+                    cv2.LINE_AA)
+    return page
+
+
+def test_single_line_crop_selects_page_profile():
+    for scale, line_height in ((0.3, 12), (0.5, 20), (0.8, 32)):
+        page = render_page(scale, line_height)
+        line = page[10:10 + line_height + 4]
+        assert select_profile(line) == select_profile(page), (scale, line_height)
+
+
+def test_uneven_background_selects_adaptive():
+    page = render_page(0.8, 32)
+    gradient = np.linspace(90, 255, page.shape[1]).astype(np.uint8)
+    assert select_profile(np.minimum(page, gradient)) == 'adaptive'
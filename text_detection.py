@@ -0,0 +1,256 @@
+"""
+Text region detection for Live Screen Text Extractor
+Sending a large, mostly empty crop to Tesseract as one --psm 6 block
+wastes time on blank space and garbles mixed layouts. This module finds
+the text segments first (morphological gradient + connected components,
+all vectorised in OpenCV) and recognises each one separately, in
+parallel, with a page segmentation mode that suits its shape.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from metrics import get_metrics
+from ocr_engine import DEFAULT_LANGUAGE, DEFAULT_OEM
+from ocr_executor import shared_pool
+from ocr_pipeline import (DEFAULT_OCR_CONFIG, LINE_OCR_CONFIG, extract_data_from_image,
+                          extract_text_from_image, resolve_language)
+
+# A detected text segment in image coordinates
+TextRegion = namedtuple('TextRegion', ['x', 'y', 'width', 'height'])
+
+# Crops smaller than this (in pixels) are cheaper to OCR in one pass
+DETECTION_MIN_PIXELS = 400 * 300
+
+# Word gaps scale with the font: the closing that joins words into line
+# segments is this many median glyph heights wide (at least
+# MIN_JOIN_DISTANCE pixels), while column gaps stay wider than that
+JOIN_HEIGHT_RATIO = 1.5
+MIN_JOIN_DISTANCE = 12
+
+_GRADIENT_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+
+def detect_text_regions(image, join_distance=None, min_size=6, min_fill=0.15, padding=4):
+    """Find text segments in a screenshot
+
+    The morphological gradient lights up glyph edges whatever the
+    foreground and background colours are. A wide closing then joins
+    letters and words into line segments, while larger horizontal gaps
+    (table columns, side-by-side panels) keep segments apart.
+
+    Args:
+        image: RGB(A) or grayscale NumPy array or PIL Image
+        join_distance: Horizontal gap in pixels still bridged within a
+            line; by default JOIN_HEIGHT_RATIO times the median glyph
+            height, so word gaps are bridged at every font size
+        min_size: Components smaller than this in either direction are noise
+        min_fill: Minimum share of a component's box covered by the
+            component; panel borders and frames fall below it
+        padding: Pixels added around each region
+
+    Returns:
+        List of TextRegion in reading order (top to bottom, then left to right)
+    """
+    pixels = np.asarray(image)
+    if pixels.ndim == 3:
+        conversion = cv2.COLOR_RGBA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        gray = cv2.cvtColor(pixels, conversion)
+    else:
+        gray = pixels
+
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, _GRADIENT_KERNEL)
+    _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if join_distance is None:
+        join_distance = _join_distance(edges, min_size)
+    joined = cv2.morphologyEx(edges, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (join_distance, 1)))
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+    stats = stats[1:]  # label 0 is the background
+    box_area = stats[:, cv2.CC_STAT_WIDTH] * stats[:, cv2.CC_STAT_HEIGHT]
+    keep = ((stats[:, cv2.CC_STAT_WIDTH] >= min_size)
+            & (stats[:, cv2.CC_STAT_HEIGHT] >= min_size)
+            & (stats[:, cv2.CC_STAT_AREA] >= min_fill * box_area))
+    stats = stats[keep]
+    if not len(stats):
+        return []
+
+    height, width = gray.shape
+    x1 = np.maximum(stats[:, cv2.CC_STAT_LEFT] - padding, 0)
+    y1 = np.maximum(stats[:, cv2.CC_STAT_TOP] - padding, 0)
+    x2 = np.minimum(stats[:, cv2.CC_STAT_LEFT] + stats[:, cv2.CC_STAT_WIDTH] + padding, width)
+    y2 = np.minimum(stats[:, cv2.CC_STAT_TOP] + stats[:, cv2.CC_STAT_HEIGHT] + padding, height)
+
+    regions = [TextRegion(int(a), int(b), int(c - a), int(d - b)) for a, b, c, d in zip(x1, y1, x2, y2)]
+    return [region for row in group_rows(regions) for region in row]
+
+
+def _join_distance(edges, min_size):
+    """Closing width for the edge image, scaled with the median glyph height"""
+    _, _, stats, _ = cv2.connectedComponentsWithStats(edges, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[heights >= min_size]
+    if not len(heights):
+        return MIN_JOIN_DISTANCE
+    return max(MIN_JOIN_DISTANCE, int(round(JOIN_HEIGHT_RATIO * float(np.median(heights)))))
+
+
+def group_rows(regions):
+    """Group regions into visual rows, each sorted left to right
+
+    A region joins the current row when its vertical centre falls inside
+    the row's extent, which keeps slightly misaligned columns together.
+    """
+    rows = []
+    row_bottom = None
+    for region in sorted(regions, key=lambda r: r.y + r.height / 2):
+        centre = region.y + region.height / 2
+        if rows and centre <= row_bottom:
+            rows[-1].append(region)
+            row_bottom = max(row_bottom, region.y + region.height)
+        else:
+            rows.append([region])
+            row_bottom = region.y + region.height
+    return [sorted(row, key=lambda r: r.x) for row in rows]
+
+
+def _iter_detected_rows(image, config, cache, max_workers, extract, lang, oem):
+    """Detect regions, run extract on each in parallel and yield rows in order
+
+    Regions are queued in reading order, so the first row is usually
+    ready after about one line's worth of OCR, and each row is yielded as
+    soon as it and every row above it are done. With lang 'auto' the
+    script is detected once on the whole image; single lines are too
+    short for OSD.
+
+    Yields:
+        List of (TextRegion, extract output) per row, left to right
+    """
+    pixels = np.asarray(image)
+    with get_metrics().timer('detect'):
+        regions = detect_text_regions(pixels)
+    if not regions:
+        return
+    lang = resolve_language(pixels, lang)
+
+    line_height = float(np.median([region.height for region in regions]))
+
+    def recognise(region):
+        view = pixels[region.y:region.y + region.height, region.x:region.x + region.width]
+        region_config = LINE_OCR_CONFIG if region.height <= 1.5 * line_height else config
+        return extract(view, region_config, cache=cache, lang=lang, oem=oem)
+
+    # The shared pool keeps its threads between calls;
+    # an explicit max_workers gets a pool of its own
+    own_pool = None
+    if max_workers:
+        own_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr-detect')
+    pool = own_pool or shared_pool()
+    rows = group_rows(regions)
+    futures = [[pool.submit(recognise, region) for region in row] for row in rows]
+    try:
+        for regions_in_row, row in zip(rows, futures):
+            yield [(region, future.result()) for region, future in zip(regions_in_row, row)]
+    finally:
+        # If the caller stops iterating, drop the rows nobody will read
+        for row in futures:
+            for future in row:
+                future.cancel()
+        if own_pool is not None:
+            own_pool.shutdown(wait=False)
+
+
+def iter_text_detected(image, config=DEFAULT_OCR_CONFIG, cache=None, max_workers=None,
+                       lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Detect text regions, OCR them in parallel and yield rows in order
+
+    Single-line regions use --psm 7; taller blocks keep config. Each
+    region is thresholded on its own, which also copes with crops that
+    mix light and dark panels.
+
+    Args:
+        image: RGB NumPy array or PIL Image
+        config: Tesseract configuration used for multi-line blocks
+        cache: Optional OCRCache shared by all regions
+        max_workers: Number of OCR threads; by default regions run on
+            ocr_executor.shared_pool()
+        lang: Tesseract language; 'auto' detects the script first
+        oem: Tesseract OCR engine mode
+
+    Yields:
+        Text of each non-empty row, segments separated by tabs
+    """
+    for row in _iter_detected_rows(image, config, cache, max_workers, extract_text_from_image,
+                                   lang, oem):
+        parts = [text for _, text in row if text]
+        if parts:
+            yield '\t'.join(parts)
+
+
+def iter_results_detected(image, config=DEFAULT_OCR_CONFIG, cache=None, max_workers=None,
+                          lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Like iter_text_detected() but with word boxes and confidences
+
+    Yields:
+        List of (TextRegion, OCRResult) for each row with any words; the
+        boxes are in the coordinates of image
+    """
+    for row in _iter_detected_rows(image, config, cache, max_workers, extract_data_from_image,
+                                   lang, oem):
+        results = [(region, result.translate(region.x, region.y))
+                   for region, result in row if result.text]
+        if results:
+            yield results
+
+
+def extract_text_detected(image, config=DEFAULT_OCR_CONFIG, cache=None, max_workers=None,
+                          lang=DEFAULT_LANGUAGE, oem=DEFAULT_OEM):
+    """Detect text regions and OCR each one in parallel
+
+    Returns:
+        Text with segments on the same row separated by tabs and rows
+        separated by newlines; see iter_text_detected()
+    """
+    return '\n'.join(iter_text_detected(image, config, cache, max_workers, lang, oem))
+
+
+def iter_text_auto(image, config=DEFAULT_OCR_CONFIG, cache=None, lang=DEFAULT_LANGUAGE,
+                   oem=DEFAULT_OEM):
+    """Yield the text of a crop row by row as it is recognised
+
+    Small crops are OCR'd in one pass and yield at most once; large ones
+    stream through iter_text_detected().
+    """
+    pixels = np.asarray(image)
+    if pixels.shape[0] * pixels.shape[1] < DETECTION_MIN_PIXELS:
+        text = extract_text_from_image(pixels, config, cache=cache, lang=lang, oem=oem)
+        if text:
+            yield text
+        return
+    yield from iter_text_detected(pixels, config, cache=cache, lang=lang, oem=oem)
+
+
+def iter_results_auto(image, config=DEFAULT_OCR_CONFIG, cache=None, lang=DEFAULT_LANGUAGE,
+                      oem=DEFAULT_OEM):
+    """Structured counterpart of iter_text_auto()
+
+    Yields rows as iter_results_detected() does; a small crop is a single
+    row holding one region that covers all of it.
+    """
+    pixels = np.asarray(image)
+    if pixels.shape[0] * pixels.shape[1] < DETECTION_MIN_PIXELS:
+        result = extract_data_from_image(pixels, config, cache=cache, lang=lang, oem=oem)
+        if result.text:
+            yield [(TextRegion(0, 0, pixels.shape[1], pixels.shape[0]), result)]
+        return
+    yield from iter_results_detected(pixels, config, cache=cache, lang=lang, oem=oem)
+
+
+def extract_text_auto(image, config=DEFAULT_OCR_CONFIG, cache=None, lang=DEFAULT_LANGUAGE,
+                      oem=DEFAULT_OEM):
+    """OCR small crops in one pass and large ones region by region"""
+    return '\n'.join(iter_text_auto(image, config, cache, lang, oem))
@@ -0,0 +1,325 @@
+"""
+Text recording for Live Screen Text Extractor
+Records how the text of a screen region changes over hours in a compact
+append-only log. Each change is stored as a line diff against the
+previous text, with a full keyframe at regular intervals so a reader can
+seek without replaying the whole session. Every record is compressed on
+its own, so a crash loses at most the record being written, and files
+are rotated at a size limit so disk use stays bounded.
+
+File layout: MAGIC, then records of
+    timestamp (float64) | kind (uint8) | payload length (uint32) | zlib(JSON)
+where a keyframe's payload is the full text and a delta's is a list of
+[first line, end line, replacement lines] edits.
+"""
+
+import difflib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from collections import namedtuple
+
+MAGIC = b'OCRLOG1\n'
+RECORDING_EXTENSION = '.ocrlog'
+
+# One recorded state of the region
+RecordedText = namedtuple('RecordedText', ['timestamp', 'text'])
+
+_HEADER = struct.Struct('<dBI')
+_KEYFRAME, _DELTA = 1, 0
+
+
+def line_diff(old, new):
+    """Line-level edit script turning old into new
+
+    Returns:
+        List of [start, end, replacement lines]; lines old[start:end]
+        are replaced by the replacement
+    """
+    old_lines, new_lines = old.split('\n'), new.split('\n')
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    return [[i1, i2, new_lines[j1:j2]]
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def apply_line_diff(old, edits):
+    """Apply an edit script from line_diff() to old"""
+    lines = old.split('\n')
+    result = []
+    position = 0
+    for start, end, replacement in edits:
+        result.extend(lines[position:start])
+        result.extend(replacement)
+        position = end
+    result.extend(lines[position:])
+    return '\n'.join(result)
+
+
+# Characters OCR swaps between frames of unchanged text
+CONFUSABLE_CHARS = (frozenset('l1I|'), frozenset('O0o'))
+
+
+def flicker_chars(old, new):
+    """Number of characters that differ between two texts only by an OCR confusion
+
+    Returns:
+        Count of positions where one character of a CONFUSABLE_CHARS
+        group replaced another, or None if the texts differ in any other
+        way (different length, any other substitution)
+    """
+    if len(old) != len(new):
+        return None
+    count = 0
+    for a, b in zip(old, new):
+        if a != b:
+            if not any(a in group and b in group for group in CONFUSABLE_CHARS):
+                return None
+            count += 1
+    return count
+
+
+def recording_files(path):
+    """Existing files of a recording, oldest first (rotated ones included)"""
+    rotated = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        rotated.append(f"{path}.{index}")
+        index += 1
+    files = list(reversed(rotated))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def _scan(f):
+    """Yield (offset, timestamp, kind, length) for each complete record
+
+    Stops quietly at a torn record left by an interrupted write.
+    """
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{getattr(f, 'name', 'file')} is not a text recording")
+    offset = len(MAGIC)
+    while offset + _HEADER.size <= size:
+        timestamp, kind, length = _HEADER.unpack(f.read(_HEADER.size))
+        if offset + _HEADER.size + length > size:
+            return
+        yield offset, timestamp, kind, length
+        offset += _HEADER.size + length
+        f.seek(offset)
+
+
+class TextRecorder:
+    """Append text snapshots to a compressed, deduplicated recording
+
+    Only the last recorded text is kept in memory, so a recorder can run
+    indefinitely. record() and close() may be called from different
+    threads; records arriving after close() are dropped.
+    """
+
+    def __init__(self, path, keyframe_interval=300.0, keyframe_every=100, noise_chars=0,
+                 max_bytes=64 * 1024 * 1024, backups=3):
+        """
+        Args:
+            path: Recording file; appended to if it already exists
+            keyframe_interval: Seconds between full-text keyframes
+            keyframe_every: Deltas after which a keyframe is forced
+            noise_chars: Treat up to this many swapped confusable
+                characters (l/1/I/|, O/0/o, see CONFUSABLE_CHARS) as OCR
+                flicker rather than a change. The default 0 keeps every
+                change; only identical or whitespace-only text counts as
+                a duplicate.
+            max_bytes: Size at which the file is rotated to path.1
+            backups: Rotated files kept; older ones are deleted
+        """
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_every = keyframe_every
+        self.noise_chars = noise_chars
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self.records_written = 0
+        self.duplicates_skipped = 0
+
+        self._last_text = None
+        self._last_keyframe = None
+        self._deltas_since_keyframe = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        """Open path for appending, cutting off any torn last record"""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                end = len(MAGIC)
+                for offset, _, _, length in _scan(f):
+                    end = offset + _HEADER.size + length
+            self._file = open(self.path, 'r+b')
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(self.path, 'wb')
+            self._file.write(MAGIC)
+        # A new file or session always starts from a keyframe
+        self._last_text = None
+
+    def is_duplicate(self, text):
+        """True if text does not differ meaningfully from the last record"""
+        last = self._last_text
+        if last is None:
+            return False
+        if text == last or text.split() == last.split():
+            return True
+        if self.noise_chars <= 0:
+            return False
+        flicker = flicker_chars(last, text)
+        return flicker is not None and flicker <= self.noise_chars
+
+    def record(self, text, timestamp=None):
+        """Record text as the region's current content
+
+        Returns:
+            True if a record was written, False for a duplicate
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._file is None:
+                return False
+            if self.is_duplicate(text):
+                self.duplicates_skipped += 1
+                return False
+            self._write(text, timestamp)
+            return True
+
+    def _write(self, text, timestamp):
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+        keyframe = (self._last_text is None
+                    or self._deltas_since_keyframe >= self.keyframe_every
+                    or timestamp - self._last_keyframe >= self.keyframe_interval)
+        if keyframe:
+            kind, payload = _KEYFRAME, text
+            self._last_keyframe = timestamp
+            self._deltas_since_keyframe = 0
+        else:
+            kind, payload = _DELTA, line_diff(self._last_text, text)
+            self._deltas_since_keyframe += 1
+
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        self._file.write(_HEADER.pack(timestamp, kind, len(data)) + data)
+        self._file.flush()
+        self._last_text = text
+        self.records_written += 1
+
+    def record_event(self, event):
+        """RegionMonitor on_event callback: record a TextEvent"""
+        self.record(event.text, event.timestamp)
+
+    def _rotate(self):
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest"""
+        self._file.close()
+        oldest = f"{self.path}.{self.backups}"
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC)
+        self._last_text = None
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RecordingReader:
+    """Query a recording written by TextRecorder by time
+
+    Opening scans record headers only (payloads are skipped, not
+    decompressed) and keeps one index entry per keyframe, so seeking to a
+    time decompresses at most one keyframe interval of records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # (timestamp, file, offset) of every keyframe, in time order
+        self._keyframes = []
+        self.start = self.end = None
+        for file_path in recording_files(path):
+            with open(file_path, 'rb') as f:
+                for offset, timestamp, kind, _ in _scan(f):
+                    if kind == _KEYFRAME:
+                        self._keyframes.append((timestamp, file_path, offset))
+                    if self.start is None:
+                        self.start = timestamp
+                    self.end = timestamp
+        self._keyframe_times = [timestamp for timestamp, _, _ in self._keyframes]
+
+    def _replay(self, first_keyframe):
+        """Yield RecordedText from keyframe index first_keyframe onwards"""
+        if first_keyframe >= len(self._keyframes):
+            return
+        _, start_file, start_offset = self._keyframes[first_keyframe]
+        files = recording_files(self.path)
+        text = None
+        for file_path in files[files.index(start_file):]:
+            with open(file_path, 'rb') as f:
+                for offset, timestamp, kind, length in _scan(f):
+                    if file_path == start_file and offset < start_offset:
+                        continue
+                    f.seek(offset + _HEADER.size)
+                    payload = json.loads(zlib.decompress(f.read(length)).decode('utf-8'))
+                    if kind == _KEYFRAME:
+                        text = payload
+                    elif text is not None:
+                        text = apply_line_diff(text, payload)
+                    else:
+                        continue  # delta whose keyframe was rotated away
+                    yield RecordedText(timestamp, text)
+
+    def between(self, start=None, end=None):
+        """Yield every recorded state with start <= timestamp <= end
+
+        Args:
+            start: Unix time; None means the beginning of the recording
+            end: Unix time; None means the end of the recording
+        """
+        first = 0 if start is None else max(0, bisect_right(self._keyframe_times, start) - 1)
+        for entry in self._replay(first):
+            if end is not None and entry.timestamp > end:
+                return
+            if start is None or entry.timestamp >= start:
+                yield entry
+
+    def text_at(self, timestamp):
+        """Text shown in the region at timestamp, or None before the first record"""
+        first = max(0, bisect_right(self._keyframe_times, timestamp) - 1)
+        current = None
+        for entry in self._replay(first):
+            if entry.timestamp > timestamp:
+                break
+            current = entry.text
+        return current
+
+    def __iter__(self):
+        return self.between()